@@ -0,0 +1,258 @@
+"""Benchmark TeslaMind hot paths and compare against a stored baseline.
+
+The suite runs ``--rounds`` times. In each round every benchmark is
+warmed up once, timed over ``--repeat`` runs (its throughput uses the
+median run) and then run once more under :mod:`tracemalloc` to record
+peak memory. A benchmark's result is its median round, and its
+``noise`` is the relative spread of throughput across rounds. Results
+are written as JSON; when a baseline is available the run fails with
+exit status 1 if any benchmark's throughput dropped by more than the
+larger of ``--threshold`` and the noise seen in either run, or its peak
+memory grew by more than ``--threshold``.
+
+Every round also times a fixed pure-Python reference loop. When the
+baseline was recorded on another platform or Python version, baseline
+throughputs are rescaled by the ratio of the two reference timings
+before comparing, and memory is only compared on the same Python
+version. On the same host they are only scaled down, when the reference
+loop shows the machine is currently slower than when the baseline was
+recorded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from workloads import BENCHMARKS, Workload  # noqa: E402
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+RESULTS_FILE = Path(__file__).resolve().parent / "results.json"
+MEMORY_SLACK_BYTES = 64 * 1024
+REFERENCE_ITERATIONS = 200_000
+
+
+def reference_throughput(repeat: int) -> float:
+    """Iterations per second of a fixed loop of dict, string and int work."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table: Dict[str, int] = {}
+        for i in range(REFERENCE_ITERATIONS):
+            key = f"k{i % 1024}"
+            table[key] = table.get(key, 0) + i
+        best = min(best, time.perf_counter() - start)
+    return REFERENCE_ITERATIONS / best
+
+
+def same_host(current: Dict[str, Any], baseline: Dict[str, Any]) -> bool:
+    return all(current.get(field) == baseline.get(field) for field in ("python", "platform"))
+
+
+def run_benchmark(name: str, workload: Workload, repeat: int) -> Dict[str, Any]:
+    """Time one round of ``name``."""
+
+    factory, unit = BENCHMARKS[name]
+    run = factory(workload)
+    run()
+    timings: List[float] = []
+    units = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = run()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(timings)
+    return {
+        "unit": unit,
+        "units": units,
+        "seconds": timings,
+        "throughput": units / median if median else float("inf"),
+        "latency_ms": median / units * 1000 if units else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def summarise(rounds: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine the rounds of one benchmark into its median round plus ``noise``."""
+
+    throughputs = [result["throughput"] for result in rounds]
+    median = statistics.median(throughputs)
+    summary = dict(sorted(rounds, key=lambda result: result["throughput"])[len(rounds) // 2])
+    summary["throughput"] = median
+    summary["peak_bytes"] = int(statistics.median(result["peak_bytes"] for result in rounds))
+    summary["noise"] = (max(throughputs) - min(throughputs)) / median if median else 0.0
+    return summary
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Return a message for every benchmark that regressed beyond ``threshold``.
+
+    The allowed throughput drop is widened to the larger ``noise`` of the
+    two runs, so benchmarks that already varied that much between rounds
+    do not fail on jitter. Baselines are rescaled by the reference-loop
+    ratio: in full for another host (throughput is skipped if either run
+    lacks it), and only downwards on the same host. Peak memory is only
+    compared when both runs used the same Python version.
+    """
+
+    ours, theirs = current.get("reference_throughput"), baseline.get("reference_throughput")
+    ratio = ours / theirs if ours and theirs else None
+    scale: float | None = ratio
+    if same_host(current, baseline):
+        scale = min(1.0, ratio) if ratio is not None else 1.0
+    compare_memory = current.get("python") == baseline.get("python")
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None:
+            continue
+        if scale is not None:
+            expected = reference["throughput"] * scale
+            tolerance = max(threshold, result.get("noise", 0.0), reference.get("noise", 0.0))
+            floor = expected * max(0.0, 1 - tolerance)
+            if result["throughput"] < floor:
+                regressions.append(
+                    f"{name}: throughput {result['throughput']:.1f} {result['unit']}/s "
+                    f"< {floor:.1f} (baseline {expected:.1f}, tolerance {tolerance:.0%})"
+                )
+        if not compare_memory:
+            continue
+        ceiling = reference["peak_bytes"] * (1 + threshold) + MEMORY_SLACK_BYTES
+        if result["peak_bytes"] > ceiling:
+            regressions.append(
+                f"{name}: peak memory {result['peak_bytes']} B > {ceiling:.0f} B "
+                f"(baseline {reference['peak_bytes']} B)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="NAME",
+        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply corpus sizes")
+    parser.add_argument(
+        "--blocklist-size", type=int, help="Number of blocked terms (before scaling)"
+    )
+    parser.add_argument(
+        "--latency", type=float, help="Seconds the stub LLM sleeps per call or batch"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per benchmark in each round"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Times to run the whole suite"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=RESULTS_FILE, help="JSON file receiving the results"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE_FILE, help="Baseline JSON to compare with"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Minimum allowed fractional slowdown, and allowed memory growth, before failing",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be positive")
+    if args.rounds < 1:
+        parser.error("--rounds must be positive")
+
+    defaults = Workload()
+    workload = Workload(
+        blocklist_size=args.blocklist_size or defaults.blocklist_size,
+        latency=defaults.latency if args.latency is None else args.latency,
+    ).scaled(args.scale)
+    results: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workload": asdict(workload),
+        "benchmarks": {},
+    }
+    names = args.names or list(BENCHMARKS)
+    references: List[float] = []
+    rounds: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+    # Interleave rounds so slow phases of a shared machine hit every benchmark.
+    for _ in range(args.rounds):
+        references.append(reference_throughput(args.repeat))
+        for name in names:
+            rounds[name].append(run_benchmark(name, workload, args.repeat))
+    results["reference_throughput"] = statistics.median(references)
+    for name in names:
+        result = results["benchmarks"][name] = summarise(rounds[name])
+        print(
+            f"{name:<26} {result['throughput']:>14.1f} {result['unit']}/s "
+            f"±{result['noise']:>4.0%} "
+            f"{result['latency_ms']:>10.4f} ms/{result['unit'].rstrip('s')} "
+            f"{result['peak_bytes'] / 1024:>10.1f} KiB peak",
+            file=sys.stderr,
+        )
+
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        return 0
+    try:
+        baseline = json.loads(args.baseline.read_text())
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; skipping comparison", file=sys.stderr)
+        return 0
+    if baseline.get("workload") != results["workload"]:
+        print("Baseline was recorded with a different workload", file=sys.stderr)
+        return 2
+    if not same_host(results, baseline):
+        notes = [
+            "rescaling throughput by the reference loop"
+            if baseline.get("reference_throughput")
+            else "skipping throughput (baseline has no reference loop)"
+        ]
+        if results["python"] != baseline.get("python"):
+            notes.append("skipping peak memory")
+        print(
+            f"WARNING baseline was recorded with Python {baseline.get('python')} on "
+            f"{baseline.get('platform')}; {' and '.join(notes)}",
+            file=sys.stderr,
+        )
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
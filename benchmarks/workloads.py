@@ -0,0 +1,302 @@
+"""Synthetic workloads for the TeslaMind hot paths.
+
+Every workload is deterministic for a given :class:`Workload` so runs
+are comparable across commits. Each benchmark function receives the
+workload and returns a zero-argument callable that performs one timed
+run and reports how many units (prompts, bytes, calls) it processed.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from teslamind.ai_client import LLMClient
+from teslamind.cache import LRUCache, SQLiteCache
+from teslamind.federated import run_federated_evaluation
+from teslamind.refinement import SelfLoopingPromptGenerator
+from teslamind.rlhf import RLHFTrainer, batched
+from teslamind.safety import BlockedTermMatcher, filter_clinical_content, filter_clinical_stream
+from teslamind.tokenizer import BPETokenizer, default_tokenizer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SYLLABLES = ("ka", "lo", "mi", "tes", "ra", "vo", "en", "qu", "is", "dor", "fa", "ne")
+Run = Callable[[], int]
+
+
+@dataclass(frozen=True)
+class Workload:
+    """Size and timing knobs shared by every benchmark."""
+
+    prompts: int = 1000
+    prompt_words: int = 40
+    blocklist_size: int = 1000
+    latency: float = 0.001
+    seed: int = 0
+
+    def scaled(self, scale: float) -> "Workload":
+        return Workload(
+            prompts=max(1, int(self.prompts * scale)),
+            prompt_words=self.prompt_words,
+            blocklist_size=max(1, int(self.blocklist_size * scale)),
+            latency=self.latency,
+            seed=self.seed,
+        )
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+
+
+def make_blocklist(workload: Workload) -> List[str]:
+    """Return ``blocklist_size`` distinct one- and two-word terms."""
+
+    rng = random.Random(workload.seed + 1)
+    terms = {"diagnosis", "treatment", "medical advice"}
+    while len(terms) < workload.blocklist_size:
+        words = [_word(rng) for _ in range(rng.randint(1, 2))]
+        terms.add(" ".join(words) + "x")
+    return sorted(terms)
+
+
+def make_corpus(workload: Workload) -> List[str]:
+    """Return synthetic prompts; roughly one in ten contains a blocked term."""
+
+    rng = random.Random(workload.seed)
+    blocklist = make_blocklist(workload)
+    prompts = []
+    for _ in range(workload.prompts):
+        words = [_word(rng) for _ in range(workload.prompt_words)]
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(blocklist))
+        prompts.append(" ".join(words).capitalize() + ".")
+    return prompts
+
+
+class StubLLM:
+    """Deterministic model stand-in that sleeps ``latency`` seconds per call."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+
+    def __call__(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return prompt[::-1]
+
+    async def transport(self, requests: Sequence[Tuple[Any, Dict[str, Any]]]) -> List[str]:
+        """:class:`~teslamind.ai_client.AsyncLLMClient` transport, one delay per batch."""
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [str(messages[-1])[::-1] for messages, _ in requests]
+
+
+def bench_safety_filter(workload: Workload) -> Run:
+    corpus = make_corpus(workload)
+    matcher = BlockedTermMatcher(make_blocklist(workload))
+
+    def run() -> int:
+        for prompt in corpus:
+            filter_clinical_content(prompt, matcher, mask=True)
+        return len(corpus)
+
+    return run
+
+
+def _large_blocklist(workload: Workload) -> Workload:
+    """The same prompts against five times the blocklist."""
+
+    return replace(workload, blocklist_size=workload.blocklist_size * 5)
+
+
+def bench_safety_filter_large(workload: Workload) -> Run:
+    return bench_safety_filter(_large_blocklist(workload))
+
+
+def bench_safety_filter_alternation(workload: Workload) -> Run:
+    """Reference: the flat ``term1|term2|...`` regex the trie matcher replaced.
+
+    Only a tenth of the prompts are screened because the alternation is
+    two orders of magnitude slower; throughput is still per prompt.
+    """
+
+    large = replace(_large_blocklist(workload), prompts=max(1, workload.prompts // 10))
+    corpus = make_corpus(large)
+    terms = sorted({term.lower() for term in make_blocklist(large)}, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
+
+    def run() -> int:
+        for prompt in corpus:
+            if pattern.search(prompt):
+                pattern.sub("[REDACTED]", prompt)
+        return len(corpus)
+
+    return run
+
+
+def bench_safety_stream(workload: Workload) -> Run:
+    text = " ".join(make_corpus(workload))
+    chunks = [text[i : i + 64] for i in range(0, len(text), 64)]
+    matcher = BlockedTermMatcher(make_blocklist(workload))
+
+    def run() -> int:
+        for _ in filter_clinical_stream(chunks, matcher, mask=True):
+            pass
+        return len(text.encode())
+
+    return run
+
+
+def bench_safety_compile(workload: Workload) -> Run:
+    blocklist = make_blocklist(workload)
+
+    def run() -> int:
+        # A single compile takes milliseconds; time a batch to keep jitter down.
+        for _ in range(10):
+            BlockedTermMatcher(blocklist)
+        return 10
+
+    return run
+
+
+def bench_federated_thread(workload: Workload) -> Run:
+    corpus = make_corpus(workload)[:200]
+    llm = StubLLM(workload.latency)
+
+    def run() -> int:
+        run_federated_evaluation(corpus, llm, shards=16, executor="thread")
+        return len(corpus)
+
+    return run
+
+
+def bench_federated_serial(workload: Workload) -> Run:
+    corpus = make_corpus(workload)
+
+    def run() -> int:
+        run_federated_evaluation(corpus, len, shards=8, return_shard_results=True)
+        return len(corpus)
+
+    return run
+
+
+def bench_rlhf_train(workload: Workload) -> Run:
+    corpus = make_corpus(workload)
+
+    @batched
+    def reward(prompts: List[str], feedback: List[str]) -> List[float]:
+        return [len(item) / 100 for item in feedback]
+
+    trainer = RLHFTrainer(reward, threshold=2.0, batch_size=64)
+
+    def run() -> int:
+        trainer.train(corpus, str.upper)
+        return len(corpus)
+
+    return run
+
+
+def bench_refinement(workload: Workload) -> Run:
+    corpus = make_corpus(workload)[:500]
+
+    def refine(prompt: str) -> Tuple[str, bool]:
+        return prompt[1:], len(prompt) > 1
+
+    def run() -> int:
+        generator = SelfLoopingPromptGenerator(max_iters=10)
+        for prompt in corpus:
+            generator.generate(prompt, refine)
+        return len(corpus)
+
+    return run
+
+
+def bench_cache_lru(workload: Workload) -> Run:
+    keys = [f"key-{i}" for i in range(workload.prompts)]
+    cache = LRUCache(max_entries=max(1, len(keys) // 2))
+
+    def run() -> int:
+        for key in keys:
+            if cache.get(key) is None:
+                cache.set(key, key)
+        return len(keys)
+
+    return run
+
+
+def bench_cache_sqlite(workload: Workload) -> Run:
+    keys = [f"key-{i}" for i in range(min(workload.prompts, 500))]
+    directory = tempfile.TemporaryDirectory(prefix="teslamind-bench-")
+    cache = SQLiteCache(Path(directory.name) / "cache.sqlite3", max_entries=len(keys))
+
+    def run() -> int:
+        for key in keys:
+            cache.get_or_compute(key, lambda: key * 4)
+        return len(keys)
+
+    # Remove the database once the benchmark is dropped (or at exit).
+    weakref.finalize(run, directory.cleanup)
+    return run
+
+
+def bench_llm_client(workload: Workload) -> Run:
+    requests = [[prompt] for prompt in make_corpus(workload)[:500]]
+    llm = StubLLM(workload.latency)
+
+    def run() -> int:
+        with LLMClient(llm.transport, max_batch_size=32, batch_window=0.001) as client:
+            client.call_many(requests)
+        return len(requests)
+
+    return run
+
+
+def bench_tokenizer(workload: Workload) -> Run:
+    text = " ".join(make_corpus(workload))
+    merges = default_tokenizer().merges
+
+    def run() -> int:
+        BPETokenizer(merges).count(text)
+        return len(text.encode())
+
+    return run
+
+
+def bench_cli_startup(workload: Workload) -> Run:
+    def run() -> int:
+        subprocess.run(
+            [sys.executable, "-m", "teslamind.cli", "list"],
+            cwd=REPO_ROOT,
+            check=True,
+            capture_output=True,
+        )
+        return 1
+
+    return run
+
+
+BENCHMARKS: Dict[str, Tuple[Callable[[Workload], Run], str]] = {
+    "safety.filter": (bench_safety_filter, "prompts"),
+    "safety.filter_large": (bench_safety_filter_large, "prompts"),
+    "safety.filter_alternation": (bench_safety_filter_alternation, "prompts"),
+    "safety.stream": (bench_safety_stream, "bytes"),
+    "safety.compile": (bench_safety_compile, "blocklists"),
+    "federated.serial": (bench_federated_serial, "prompts"),
+    "federated.thread": (bench_federated_thread, "prompts"),
+    "rlhf.train": (bench_rlhf_train, "prompts"),
+    "refinement.generate": (bench_refinement, "prompts"),
+    "cache.lru": (bench_cache_lru, "lookups"),
+    "cache.sqlite": (bench_cache_sqlite, "lookups"),
+    "llm.client": (bench_llm_client, "calls"),
+    "tokenizer.count": (bench_tokenizer, "bytes"),
+    "cli.startup": (bench_cli_startup, "runs"),
+}
@@ -1,14 +1,29 @@
-"""Evaluate prompts using stubbed LLM."""
+"""Evaluate prompts using stubbed LLM.
+
+The harness is a three-stage pipeline: prompt files are fingerprinted
+and read lazily, model calls run on a bounded thread pool, and scores
+are appended to a JSON Lines file as soon as each prompt completes.
+Each prompt's fingerprint and score are committed to the SQLite manifest
+at the same time, so an interrupted run loses no finished work.
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import json
 from pathlib import Path
+import sqlite3
 import sys
+from typing import Callable, Iterable, Iterator, Tuple
 
 THIRD_PARTY = Path(__file__).resolve().parent.parent / "third_party"
 if str(THIRD_PARTY) not in sys.path:
     sys.path.append(str(THIRD_PARTY))
 
+from teslamind.ai_client import response_key
+from teslamind.cache import SQLiteCache
 from teslamind.prompt import Prompt
 from teslamind.metrics import length_score
+from teslamind.utils.files import file_fingerprint
 
 try:
     from langchain.chat_models import ChatOpenAI
@@ -30,19 +45,198 @@ except Exception:  # offline fallback
         pass
 
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
-RESULTS_FILE = Path(__file__).resolve().parent / "results.json"
+RESULTS_FILE = Path(__file__).resolve().parent / "results.jsonl"
+CACHE_FILE = Path(__file__).resolve().parent / ".cache" / "responses.sqlite3"
+MANIFEST_FILE = Path(__file__).resolve().parent / ".cache" / "manifest.sqlite3"
 
 
-def main() -> None:
-    llm = ChatOpenAI()
-    results = []
-    for prompt_file in PROMPT_DIR.glob("*.txt"):
+def _model_params(llm) -> dict:
+    params = {"model": getattr(llm, "model_name", type(llm).__name__)}
+    for name in ("temperature", "max_tokens"):
+        if hasattr(llm, name):
+            params[name] = getattr(llm, name)
+    return params
+
+
+class Manifest:
+    """Prompt fingerprints and scores, one SQLite row per prompt.
+
+    Rows are looked up and written one prompt at a time, so memory does
+    not grow with the catalog, and each write is committed immediately
+    so a crash keeps every score recorded before it. Changing the model
+    parameters discards all rows; :meth:`finish` drops rows for prompts
+    that no longer exist once a run completes.
+    """
+
+    def __init__(self, path: Path, params: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prompts "
+                "(name TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, score, run INTEGER NOT NULL)"
+            )
+            meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+            encoded = json.dumps(params, sort_keys=True)
+            if meta.get("params") != encoded:
+                self._conn.execute("DELETE FROM prompts")
+            self.run = int(meta.get("run", 0)) + 1
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("params", encoded), ("run", self.run)],
+            )
+
+    def get(self, name: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT fingerprint, score FROM prompts WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[0]), "score": row[1]}
+
+    def record(self, name: str, fingerprint: dict, score) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompts (name, fingerprint, score, run) VALUES (?, ?, ?, ?)",
+                (name, json.dumps(fingerprint), score, self.run),
+            )
+
+    def finish(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM prompts WHERE run != ?", (self.run,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _plan(
+    prompt_dir: Path, manifest: Manifest | None
+) -> Iterator[Tuple[Path, dict, dict | None]]:
+    """Yield ``(prompt_file, fingerprint, reusable_entry)`` lazily."""
+
+    for prompt_file in prompt_dir.glob("*.txt"):
+        prior = None if manifest is None else manifest.get(prompt_file.name)
+        fingerprint = file_fingerprint(prompt_file, prior)
+        if prior is None or prior.get("sha256") != fingerprint["sha256"]:
+            prior = None
+        yield prompt_file, fingerprint, prior
+
+
+def _bounded_map(func: Callable, items: Iterable, concurrency: int) -> Iterator[Tuple]:
+    """Map ``func`` over ``items`` on a thread pool, yielding in input order.
+
+    At most ``2 * concurrency`` items are in flight so memory stays flat
+    regardless of how many items there are.
+    """
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        window: deque = deque()
+        for item in items:
+            window.append((item, pool.submit(func, item)))
+            if len(window) >= 2 * concurrency:
+                done, future = window.popleft()
+                yield done, future.result()
+        while window:
+            done, future = window.popleft()
+            yield done, future.result()
+
+
+def _responder(llm, params: dict, cache) -> Callable:
+    def respond(item: Tuple[Path, dict, dict | None]) -> str | None:
+        prompt_file, _, prior = item
+        if prior is not None:
+            return None
         prompt = Prompt.from_file(prompt_file)
         messages = [SystemMessage(content=prompt.text), HumanMessage(content="ping")]
-        response = llm(messages)
-        score = length_score(response.content)
-        results.append({"prompt": prompt_file.name, "score": score.value})
-    RESULTS_FILE.write_text(json.dumps(results, indent=2))
+        if cache is None:
+            return llm(messages).content
+        key = response_key(messages, **params)
+        return cache.get_or_compute(key, lambda: llm(messages).content)
+
+    return respond
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--prompts",
+        type=Path,
+        default=PROMPT_DIR,
+        help="Directory of *.txt prompt files to evaluate",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=CACHE_FILE,
+        help="SQLite file used to cache model responses",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query the model instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--cache-max-entries",
+        type=int,
+        default=100_000,
+        help="Evict least recently used responses beyond this many entries",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse scores from the manifest for prompts that have not changed",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of model calls in flight",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_FILE,
+        help="JSON Lines file receiving one result per prompt",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=MANIFEST_FILE,
+        help="SQLite manifest recording prompt fingerprints and their scores",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be positive")
+
+    llm = ChatOpenAI()
+    params = _model_params(llm)
+    cache = None if args.no_cache else SQLiteCache(args.cache, max_entries=args.cache_max_entries)
+    manifest = Manifest(args.manifest, params)
+    evaluated = reused = 0
+    pipeline = _bounded_map(
+        _responder(llm, params, cache),
+        _plan(args.prompts, manifest if args.incremental else None),
+        args.concurrency,
+    )
+    try:
+        with args.output.open("w") as out:
+            for (prompt_file, fingerprint, prior), content in pipeline:
+                if prior is not None:
+                    score = prior["score"]
+                    reused += 1
+                else:
+                    score = length_score(content).value
+                    evaluated += 1
+                manifest.record(prompt_file.name, fingerprint, score)
+                out.write(json.dumps({"prompt": prompt_file.name, "score": score}) + "\n")
+                out.flush()
+        manifest.finish()
+    finally:
+        manifest.close()
+    print(f"Evaluated {evaluated} prompt(s), reused {reused}", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
@@ -1,18 +1,49 @@
-"""TeslaMind core package."""
+"""TeslaMind core package.
+
+Public names are resolved lazily on first access so that importing a
+submodule such as :mod:`teslamind.cli` does not pull in the advanced
+helpers and their dependencies.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from .version import __version__
-from .prompt import Prompt
-from .persona import Persona
-from .advanced import (
-    FederatedShardResult,
-    RLHFResult,
-    RLHFTrainer,
-    RefinementHistory,
-    SelfLoopingPromptGenerator,
-    filter_clinical_content,
-    mask_sensitive_terms,
-    run_federated_evaluation,
-)
+
+if TYPE_CHECKING:
+    from .persona import Persona
+    from .prompt import Prompt
+    from .federated import FederatedShardResult, run_federated_evaluation
+    from .refinement import RefinementHistory, RefinementNode, SelfLoopingPromptGenerator
+    from .rlhf import RLHFResult, RLHFTrainer
+    from .safety import (
+        BlockedTermMatcher,
+        StreamingSafetyFilter,
+        afilter_clinical_stream,
+        filter_clinical_content,
+        filter_clinical_stream,
+        mask_sensitive_terms,
+    )
+
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "Prompt": "prompt",
+    "Persona": "persona",
+    "SelfLoopingPromptGenerator": "refinement",
+    "RefinementHistory": "refinement",
+    "RefinementNode": "refinement",
+    "run_federated_evaluation": "federated",
+    "FederatedShardResult": "federated",
+    "RLHFTrainer": "rlhf",
+    "RLHFResult": "rlhf",
+    "BlockedTermMatcher": "safety",
+    "StreamingSafetyFilter": "safety",
+    "filter_clinical_content": "safety",
+    "filter_clinical_stream": "safety",
+    "afilter_clinical_stream": "safety",
+    "mask_sensitive_terms": "safety",
+}
 
 __all__ = [
     "Prompt",
@@ -20,10 +51,28 @@ __all__ = [
     "__version__",
     "SelfLoopingPromptGenerator",
     "RefinementHistory",
+    "RefinementNode",
     "run_federated_evaluation",
     "FederatedShardResult",
     "RLHFTrainer",
     "RLHFResult",
+    "BlockedTermMatcher",
+    "StreamingSafetyFilter",
     "filter_clinical_content",
+    "filter_clinical_stream",
+    "afilter_clinical_stream",
     "mask_sensitive_terms",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
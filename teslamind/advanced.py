@@ -2,18 +2,30 @@
 
 from __future__ import annotations
 
-from .refinement import RefinementHistory, SelfLoopingPromptGenerator
+from .refinement import RefinementHistory, RefinementNode, SelfLoopingPromptGenerator
 from .federated import FederatedShardResult, run_federated_evaluation
 from .rlhf import RLHFResult, RLHFTrainer
-from .safety import filter_clinical_content, mask_sensitive_terms
+from .safety import (
+    BlockedTermMatcher,
+    StreamingSafetyFilter,
+    afilter_clinical_stream,
+    filter_clinical_content,
+    filter_clinical_stream,
+    mask_sensitive_terms,
+)
 
 __all__ = [
     "SelfLoopingPromptGenerator",
     "RefinementHistory",
+    "RefinementNode",
     "run_federated_evaluation",
     "FederatedShardResult",
     "RLHFTrainer",
     "RLHFResult",
+    "BlockedTermMatcher",
+    "StreamingSafetyFilter",
     "filter_clinical_content",
+    "filter_clinical_stream",
+    "afilter_clinical_stream",
     "mask_sensitive_terms",
 ]
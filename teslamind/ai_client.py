@@ -1,6 +1,373 @@
-"""AI client wrapper."""
-from typing import List
+"""AI client wrapper.
 
+:func:`call_llm` performs a single blocking request. :class:`AsyncLLMClient`
+batches, coalesces and rate-limits many concurrent requests over a
+pluggable transport, and :class:`LLMClient` exposes the same behaviour
+to synchronous callers.
+"""
+from __future__ import annotations
 
-def call_llm(messages: List[str]) -> str:
+import asyncio
+import hashlib
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .cache import SQLiteCache
+from .exceptions import TransportError
+from .instrumentation import get_instrumentation
+
+Request = Tuple[Sequence[Any], Dict[str, Any]]
+Transport = Callable[[List[Request]], Awaitable[List[str]]]
+
+
+def _message_payload(message: Any) -> List[str]:
+    if isinstance(message, str):
+        return ["", message]
+    return [type(message).__name__, str(getattr(message, "content", message))]
+
+
+def response_key(messages: Sequence[Any], **params: Any) -> str:
+    """Return a content hash identifying a request.
+
+    ``messages`` may be plain strings or message objects with a
+    ``content`` attribute (such as LangChain's ``SystemMessage``); the
+    message class is part of the key so roles are not conflated.
+    ``params`` are model parameters such as the model name or
+    temperature.
+    """
+
+    payload = {
+        "messages": [_message_payload(message) for message in messages],
+        "params": params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _complete(messages: List[str], **params: Any) -> str:
     return "response"
+
+
+def call_llm(
+    messages: List[str],
+    *,
+    cache: SQLiteCache | None = None,
+    **params: Any,
+) -> str:
+    """Send ``messages`` to the model and return its reply.
+
+    When ``cache`` is given, replies are looked up by
+    :func:`response_key` first and stored after a miss.
+    """
+
+    instrumentation = get_instrumentation()
+    instrumentation.count("llm.calls")
+    with instrumentation.span("llm.call_seconds", cached=cache is not None):
+        if cache is None:
+            return _complete(messages, **params)
+        key = response_key(messages, **params)
+        return cache.get_or_compute(key, lambda: _complete(messages, **params))
+
+
+async def local_transport(requests: List[Request]) -> List[str]:
+    """Transport answering each request with the in-process model stub."""
+
+    return [_complete(list(messages), **params) for messages, params in requests]
+
+
+class HTTPTransport:
+    """POST request batches as JSON over a pool of keep-alive connections.
+
+    The endpoint receives ``{"requests": [{"messages": [[role, content],
+    ...], "params": {...}}, ...]}`` and must answer with
+    ``{"responses": [...]}`` in the same order. Up to ``pool_size``
+    connections are opened and reused across batches.
+    """
+
+    def __init__(self, url: str, *, pool_size: int = 4, timeout: float = 30.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError("url must use http or https")
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = parts.path or "/"
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size)
+        self.connections_opened = 0
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.connections_opened += 1
+            factory = (
+                http.client.HTTPSConnection
+                if self._scheme == "https"
+                else http.client.HTTPConnection
+            )
+            return factory(self._netloc, timeout=self.timeout)
+
+    def _post(self, requests: List[Request]) -> List[str]:
+        body = json.dumps(
+            {
+                "requests": [
+                    {"messages": [_message_payload(m) for m in messages], "params": params}
+                    for messages, params in requests
+                ]
+            },
+            default=str,
+        )
+        conn = self._acquire()
+        try:
+            conn.request("POST", self._path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise TransportError(f"request to {self._netloc} failed: {exc}") from exc
+        self._idle.put(conn)
+        if response.status >= 400:
+            raise TransportError(f"{self._netloc} answered HTTP {response.status}")
+        replies = json.loads(data)["responses"]
+        if len(replies) != len(requests):
+            raise TransportError("response count does not match request count")
+        return replies
+
+    async def __call__(self, requests: List[Request]) -> List[str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._post, requests)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for coroutines.
+
+    ``rate`` tokens are added per second up to ``capacity`` (defaults to
+    ``rate``); :meth:`acquire` waits until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class AsyncLLMClient:
+    """Asynchronous LLM client with coalescing, micro-batching and retries.
+
+    Identical requests (same :func:`response_key`) that are in flight at
+    the same time share one transport call. Other requests arriving
+    within ``batch_window`` seconds are grouped into batches of at most
+    ``max_batch_size``. Each transport call waits on the optional
+    ``rate`` limiter (calls per second), at most ``max_concurrency``
+    calls run at once, and failures are retried ``max_retries`` times
+    with exponential ``backoff``.
+    """
+
+    def __init__(
+        self,
+        transport: Transport = local_transport,
+        *,
+        max_batch_size: int = 16,
+        batch_window: float = 0.005,
+        max_concurrency: int = 8,
+        rate: float | None = None,
+        burst: float | None = None,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be positive")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        self.transport = transport
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate = rate
+        self.burst = burst
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._limiter = TokenBucket(rate, burst) if rate is not None else None
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[Tuple[Request, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set = set()
+        self.coalesced = 0
+        self.batches_sent = 0
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, resetting loop-bound state if it changed.
+
+        Semaphores, locks and futures belong to one event loop, so a client
+        reused under a second :func:`asyncio.run` gets fresh ones; requests
+        left over from a finished loop can never complete and are dropped.
+        """
+
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._limiter = TokenBucket(self.rate, self.burst) if self.rate is not None else None
+            self._inflight = {}
+            self._pending = []
+            self._timer = None
+            self._tasks = set()
+        return loop
+
+    async def call(self, messages: Sequence[Any], **params: Any) -> str:
+        """Send ``messages`` and return the model's reply."""
+
+        loop = self._bind()
+        key = response_key(messages, **params)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = loop.create_future()
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self._pending.append(((messages, params), future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    async def call_many(self, requests: Sequence[Sequence[Any]], **params: Any) -> List[str]:
+        """Send several message lists concurrently, preserving order."""
+
+        return list(await asyncio.gather(*(self.call(messages, **params) for messages in requests)))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[Request, asyncio.Future]]) -> None:
+        requests = [request for request, _ in batch]
+        instrumentation = get_instrumentation()
+        instrumentation.count("llm.batches")
+        instrumentation.count("llm.requests", len(requests))
+        try:
+            async with self._slots:
+                replies = await self._transmit(requests)
+        except BaseException as exc:
+            # Whatever went wrong (limiter, semaphore, cancellation), every
+            # caller awaiting this batch must be released.
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        self.batches_sent += 1
+        for (_, future), reply in zip(batch, replies):
+            if not future.done():
+                future.set_result(reply)
+
+    async def _transmit(self, requests: List[Request]) -> List[str]:
+        instrumentation = get_instrumentation()
+        attempt = 0
+        while True:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            start = time.perf_counter()
+            try:
+                replies = list(await self.transport(requests))
+                if len(replies) != len(requests):
+                    raise TransportError(
+                        f"transport returned {len(replies)} replies "
+                        f"for {len(requests)} requests"
+                    )
+            except Exception:
+                instrumentation.count("llm.transport_errors")
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2**attempt)
+                attempt += 1
+                continue
+            instrumentation.observe("llm.batch_seconds", time.perf_counter() - start)
+            return replies
+
+
+class LLMClient:
+    """Synchronous facade over :class:`AsyncLLMClient`.
+
+    A private event loop runs on a daemon thread so calls from many
+    threads share one batching client. Use as a context manager or call
+    :meth:`close` when done.
+    """
+
+    def __init__(self, transport: Transport = local_transport, **options: Any) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.client = AsyncLLMClient(transport, **options)
+
+    def call(self, messages: Sequence[Any], **params: Any) -> str:
+        return asyncio.run_coroutine_threadsafe(
+            self.client.call(messages, **params), self._loop
+        ).result()
+
+    def call_many(self, requests: Sequence[Sequence[Any]], **params: Any) -> List[str]:
+        return asyncio.run_coroutine_threadsafe(
+            self.client.call_many(requests, **params), self._loop
+        ).result()
+
+    def close(self) -> None:
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
@@ -1,12 +1,332 @@
-"""Simple in-memory cache."""
-from typing import Dict
+"""Simple in-memory and on-disk caches.
 
-_CACHE: Dict[str, str] = {}
+The module-level :func:`get` and :func:`set` helpers operate on a shared
+:class:`LRUCache` built from :class:`~teslamind.config.Config`; call
+:func:`configure` to resize it or switch caching off. :class:`SQLiteCache`
+persists string values across processes and runs.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, Tuple
+
+from .config import Config
+
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+def _sizeof(key: Hashable, value: Any) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with optional TTL.
+
+    ``max_entries`` and ``max_bytes`` bound the cache; when either limit
+    is exceeded the least recently used entries are evicted. ``ttl`` is
+    the default lifetime in seconds of an entry and can be overridden per
+    :meth:`set` call. Sizes are estimated with ``sizeof(key, value)``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        *,
+        sizeof: Callable[[Hashable, Any], int] = _sizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[Any, int, float | None]] = OrderedDict()
+        self._nbytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self._clock() + ttl
+        size = self._sizeof(key, value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._nbytes += size
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the hit/miss/eviction counters."""
+
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._nbytes -= size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats.evictions += 1
+
+
+class SQLiteCache:
+    """Persistent string cache stored in a SQLite database.
+
+    The database runs in WAL mode and every write happens inside an
+    immediate transaction, so several worker processes can share one
+    file safely. When ``max_entries`` or ``max_bytes`` is exceeded the
+    least recently read entries are evicted. Connections are opened per
+    thread and per process.
+
+    Reads never take the write lock: hits are timestamped in memory and
+    the recency updates are applied in bulk inside the next write
+    transaction, or once ``touch_batch`` hits are pending, so eviction
+    order is exact for this instance and catches up for other processes
+    at its next write.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        *,
+        timeout: float = 30.0,
+        touch_batch: int = 256,
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+        if touch_batch < 1:
+            raise ValueError("touch_batch must be positive")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.touch_batch = touch_batch
+        self._touched: Dict[str, float] = {}
+        self._touch_lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _count(self, field: str) -> None:
+        with self._stats_lock:
+            setattr(self._stats, field, getattr(self._stats, field) + 1)
+
+    def _apply_touches(self, conn: sqlite3.Connection) -> None:
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ? AND accessed < ?",
+                [(accessed, key, accessed) for key, accessed in touched.items()],
+            )
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return default
+        with self._touch_lock:
+            self._touched[key] = time.time()
+            flush = len(self._touched) >= self.touch_batch
+        if flush:
+            with self._transaction() as conn:
+                self._apply_touches(conn)
+        self._count("hits")
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        size = len(key.encode()) + len(value.encode())
+        with self._transaction() as conn:
+            self._apply_touches(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            evicted = 0
+            if self.max_entries is not None:
+                evicted += conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                    "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            if self.max_bytes is not None:
+                evicted += conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM ("
+                    "SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total "
+                    "FROM entries) WHERE total > ?)",
+                    (self.max_bytes,),
+                ).rowcount
+        with self._stats_lock:
+            self._stats.evictions += evicted
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Apply pending recency updates and close this thread's connection."""
+
+        if self._touched:
+            with self._transaction() as writer:
+                self._apply_touches(writer)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._stats_lock:
+            return CacheStats(**vars(self._stats))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def _build(config: Config) -> LRUCache:
+    return LRUCache(
+        max_entries=config.cache_max_entries,
+        max_bytes=config.cache_max_bytes,
+        ttl=config.cache_ttl,
+    )
+
+
+_CONFIG = Config()
+_CACHE = _build(_CONFIG)
+
+
+def configure(config: Config) -> LRUCache:
+    """Rebuild the default cache from ``config`` and return it."""
+
+    global _CONFIG, _CACHE
+    _CONFIG = config
+    _CACHE = _build(config)
+    return _CACHE
+
+
+def default_cache() -> LRUCache:
+    return _CACHE
 
 
 def get(key: str) -> str | None:
+    if not _CONFIG.cache_enabled:
+        return None
     return _CACHE.get(key)
 
 
 def set(key: str, value: str) -> None:
-    _CACHE[key] = value
+    if _CONFIG.cache_enabled:
+        _CACHE.set(key, value)
@@ -0,0 +1,234 @@
+"""Persisted prompt catalog index.
+
+The index records each prompt file's name, size, modification time and
+content hash together with any :class:`~teslamind.models.PromptMeta`
+found in ``metadata/*.json``. :meth:`PromptCatalog.refresh` only
+re-hashes files whose size or modification time changed, and prompt text
+is read lazily on demand.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from .models.prompt import PromptMeta
+from .prompt import Prompt
+from .utils.files import file_fingerprint
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+PROMPT_DIR = PACKAGE_ROOT / "prompts"
+METADATA_DIR = PACKAGE_ROOT / "metadata"
+INDEX_VERSION = 1
+
+
+def default_index_path(prompt_dir: Path, kind: str = "catalog", suffix: str = ".json") -> Path:
+    """Return the location of the ``kind`` index for ``prompt_dir``.
+
+    Indexes live under ``$TESLAMIND_CACHE_DIR`` (default
+    ``~/.cache/teslamind``) and are named after the catalog directory.
+    """
+
+    base = Path(os.environ.get("TESLAMIND_CACHE_DIR", Path.home() / ".cache" / "teslamind"))
+    digest = sha256(str(prompt_dir.resolve()).encode()).hexdigest()[:16]
+    return base / f"{kind}-{digest}{suffix}"
+
+
+@dataclass
+class CatalogEntry:
+    """A prompt file recorded in the catalog index."""
+
+    name: str
+    path: str
+    category: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    meta: PromptMeta | None = None
+
+    @property
+    def text(self) -> str:
+        return Path(self.path).read_text()
+
+    def load(self) -> Prompt:
+        return Prompt(name=self.name, text=self.text)
+
+
+def _scan(directory: Path, suffix: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+class PromptCatalog:
+    """Index over the user and developer prompt catalogs."""
+
+    def __init__(
+        self,
+        prompt_dir: Path = PROMPT_DIR,
+        metadata_dir: Path | None = METADATA_DIR,
+        index_path: Path | None = None,
+    ) -> None:
+        self.prompt_dir = prompt_dir.resolve()
+        self.metadata_dir = metadata_dir.resolve() if metadata_dir is not None else None
+        self.index_path = index_path or default_index_path(self.prompt_dir)
+        self._prompts: Dict[str, Dict[str, Any]] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._entries: List[CatalogEntry] | None = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION:
+            self._prompts = data.get("prompts", {})
+            self._metadata = data.get("metadata", {})
+
+    def _save(self) -> None:
+        data = {"version": INDEX_VERSION, "prompts": self._prompts, "metadata": self._metadata}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.index_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _refresh_files(
+        records: Dict[str, Dict[str, Any]],
+        files: Iterator[os.DirEntry],
+        extra: Callable[[Path], Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        refreshed: Dict[str, Dict[str, Any]] = {}
+        for entry in files:
+            previous = records.get(entry.path)
+            stat = entry.stat()
+            if (
+                previous is not None
+                and previous["size"] == stat.st_size
+                and previous["mtime_ns"] == stat.st_mtime_ns
+            ):
+                refreshed[entry.path] = previous
+                continue
+            record = file_fingerprint(Path(entry.path), previous)
+            record.update(extra(Path(entry.path)))
+            refreshed[entry.path] = record
+        return refreshed
+
+    def refresh(self) -> "PromptCatalog":
+        """Bring the index up to date with the filesystem and persist it."""
+
+        def prompt_info(directory: Path, category: str) -> Dict[str, Dict[str, Any]]:
+            return self._refresh_files(
+                {p: r for p, r in self._prompts.items() if r["category"] == category},
+                _scan(directory, ".txt"),
+                lambda path: {"name": path.stem, "category": category},
+            )
+
+        prompts = prompt_info(self.prompt_dir, "user")
+        prompts.update(prompt_info(self.prompt_dir / "developer", "developer"))
+        metadata: Dict[str, Dict[str, Any]] = {}
+        if self.metadata_dir is not None:
+            metadata = self._refresh_files(
+                self._metadata, _scan(self.metadata_dir, ".json"), _read_metadata
+            )
+        if prompts != self._prompts or metadata != self._metadata:
+            self._prompts = prompts
+            self._metadata = metadata
+            self._save()
+        self._entries = None
+        return self
+
+    def entries(self, category: str | None = None) -> List[CatalogEntry]:
+        """Return entries sorted by category and name, optionally for one ``category``."""
+
+        if self._entries is None:
+            meta_by_path: Dict[str, PromptMeta] = {}
+            for record in self._metadata.values():
+                for path, meta in record.get("records", []):
+                    meta_by_path[path] = PromptMeta(**meta)
+            self._entries = sorted(
+                (
+                    CatalogEntry(
+                        name=record["name"],
+                        path=path,
+                        category=record["category"],
+                        size=record["size"],
+                        mtime_ns=record["mtime_ns"],
+                        sha256=record["sha256"],
+                        meta=meta_by_path.get(path),
+                    )
+                    for path, record in self._prompts.items()
+                ),
+                key=lambda entry: (entry.category, entry.name),
+            )
+        if category is None:
+            return list(self._entries)
+        return [entry for entry in self._entries if entry.category == category]
+
+    def get(self, name: str, category: str = "user") -> CatalogEntry | None:
+        for entry in self.entries(category):
+            if entry.name == name:
+                return entry
+        return None
+
+    def filter(
+        self,
+        *,
+        category: str | None = None,
+        domain: str | None = None,
+        license: str | None = None,
+        min_tokens: int | None = None,
+        max_tokens: int | None = None,
+    ) -> List[CatalogEntry]:
+        """Return entries whose metadata matches every given criterion."""
+
+        matches = []
+        for entry in self.entries(category):
+            meta = entry.meta
+            if domain is not None and (meta is None or meta.domain != domain):
+                continue
+            if license is not None and (meta is None or meta.license != license):
+                continue
+            if min_tokens is not None or max_tokens is not None:
+                tokens = meta.length_tokens if meta is not None else None
+                if tokens is None:
+                    continue
+                if min_tokens is not None and tokens < min_tokens:
+                    continue
+                if max_tokens is not None and tokens > max_tokens:
+                    continue
+            matches.append(entry)
+        return matches
+
+
+def _read_metadata(path: Path) -> Dict[str, Any]:
+    """Return ``{"records": [[prompt_path, meta], ...]}`` for a metadata file."""
+
+    try:
+        data = json.loads(path.read_text())
+    except ValueError:
+        return {"records": []}
+    items = data if isinstance(data, list) else [data]
+    records = []
+    fields = set(PromptMeta.__dataclass_fields__)
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            meta = PromptMeta(**{k: v for k, v in item.items() if k in fields})
+        except TypeError:
+            continue
+        target = (path.parent / meta.prompt_path).resolve()
+        records.append([str(target), asdict(meta)])
+    return {"records": records}
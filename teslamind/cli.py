@@ -2,23 +2,37 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 from pathlib import Path
-from typing import Iterable
+from typing import List
 
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
 DEVELOPER_DIR = PROMPT_DIR / "developer"
+METADATA_DIR = Path(__file__).resolve().parent.parent / "metadata"
 
 
-def _iter_prompts(directory: Path) -> Iterable[Path]:
-    if not directory.exists():
+# ``list`` and ``show`` deliberately bypass PromptCatalog: importing the
+# catalog (and the metadata models behind it) would break the startup
+# budget enforced by tests/test_import_time.py, and neither command needs
+# hashes or metadata. ``list`` reads one directory listing without a stat
+# per file and ``show`` opens a single known path.
+def _prompt_names(directory: Path) -> List[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                entry.name[: -len(".txt")]
+                for entry in entries
+                if entry.name.endswith(".txt") and entry.is_file()
+            )
+    except FileNotFoundError:
         return []
-    return sorted(p for p in directory.glob("*.txt") if p.is_file())
 
 
 def list_prompts(*, developer: bool = False) -> None:
     directory = DEVELOPER_DIR if developer else PROMPT_DIR
-    for prompt in _iter_prompts(directory):
-        print(prompt.stem)
+    for name in _prompt_names(directory):
+        print(name)
 
 
 def show_prompt(name: str, *, developer: bool = False) -> None:
@@ -30,6 +44,67 @@ def show_prompt(name: str, *, developer: bool = False) -> None:
     print(path.read_text())
 
 
+def find_prompts(
+    *,
+    developer: bool = False,
+    domain: str | None = None,
+    license: str | None = None,
+    min_tokens: int | None = None,
+    max_tokens: int | None = None,
+) -> None:
+    # Imported here so that ``list`` and ``show`` stay cheap to start.
+    from .catalog import PromptCatalog
+
+    catalog = PromptCatalog(PROMPT_DIR).refresh()
+    matches = catalog.filter(
+        category="developer" if developer else "user",
+        domain=domain,
+        license=license,
+        min_tokens=min_tokens,
+        max_tokens=max_tokens,
+    )
+    for entry in matches:
+        meta = entry.meta
+        fields = (
+            entry.name,
+            (meta and meta.domain) or "-",
+            (meta and meta.license) or "-",
+            str(meta.length_tokens) if meta and meta.length_tokens is not None else "-",
+        )
+        print("\t".join(fields))
+
+
+def search_prompts(
+    query: str, *, limit: int = 10, category: str | None = None, quick: bool = False
+) -> None:
+    from .catalog import PromptCatalog
+    from .search import SearchIndex
+
+    refresh = "directories" if quick else "files"
+    index = SearchIndex.for_catalog(PromptCatalog(PROMPT_DIR), refresh=refresh)
+    for hit in index.search(query, limit=limit, category=category):
+        print(f"{hit.name}\t{hit.category}\t{hit.score:.3f}")
+
+
+def recompute_tokens(*, write: bool = False, merges: Path | None = None) -> None:
+    from .tokenizer import BPETokenizer, default_tokenizer
+
+    tokenizer = default_tokenizer() if merges is None else BPETokenizer.load(merges)
+    for path in sorted(METADATA_DIR.glob("*.json")):
+        data = json.loads(path.read_text())
+        if not isinstance(data, dict) or "prompt_path" not in data:
+            continue
+        prompt_path = path.parent / data["prompt_path"]
+        if not prompt_path.exists():
+            continue
+        count = tokenizer.count(prompt_path.read_text())
+        previous = data.get("length_tokens")
+        print(f"{path.stem}\t{previous if previous is not None else '-'}\t{count}")
+        if write and previous != count:
+            data["length_tokens"] = count
+            path.write_text(json.dumps(data, indent=2) + "\n")
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(prog="teslamind")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -46,11 +121,75 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Look up the prompt in the developer catalog",
     )
+    find = sub.add_parser("find", help="Filter prompts by metadata using the catalog index")
+    find.add_argument("--domain", help="Only prompts in this domain")
+    find.add_argument("--license", help="Only prompts under this license")
+    find.add_argument("--min-tokens", type=int, help="Minimum length_tokens")
+    find.add_argument("--max-tokens", type=int, help="Maximum length_tokens")
+    find.add_argument(
+        "--developer",
+        action="store_true",
+        help="Search the developer catalog",
+    )
+    search = sub.add_parser("search", help="Full-text search over prompt contents")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--limit", type=int, default=10, help="Maximum number of results")
+    search.add_argument(
+        "--quick",
+        action="store_true",
+        help="Skip the file scan unless a catalog directory changed (misses in-place edits)",
+    )
+    scope = search.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--developer",
+        action="store_const",
+        const="developer",
+        dest="category",
+        help="Only search the developer catalog",
+    )
+    scope.add_argument(
+        "--user",
+        action="store_const",
+        const="user",
+        dest="category",
+        help="Only search the user catalog",
+    )
+    tokens = sub.add_parser(
+        "tokens",
+        help="Compare length_tokens in metadata with recomputed (approximate) counts",
+    )
+    tokens.add_argument(
+        "--merges",
+        type=Path,
+        help="Model merges.txt to count with instead of the approximate bundled table",
+    )
+    tokens.add_argument(
+        "--write",
+        action="store_true",
+        help="Update metadata files whose length_tokens differs",
+    )
     args = parser.parse_args(argv)
     if args.cmd == "list":
         list_prompts(developer=args.developer)
     elif args.cmd == "show":
         show_prompt(args.name, developer=args.developer)
+    elif args.cmd == "find":
+        find_prompts(
+            developer=args.developer,
+            domain=args.domain,
+            license=args.license,
+            min_tokens=args.min_tokens,
+            max_tokens=args.max_tokens,
+        )
+    elif args.cmd == "search":
+        search_prompts(
+            " ".join(args.query),
+            limit=args.limit,
+            category=args.category,
+            quick=args.quick,
+        )
+    elif args.cmd == "tokens":
+        recompute_tokens(write=args.write, merges=args.merges)
 
 if __name__ == "__main__":
     main()
@@ -4,3 +4,6 @@ from dataclasses import dataclass
 @dataclass
 class Config:
     cache_enabled: bool = True
+    cache_max_entries: int | None = 1024
+    cache_max_bytes: int | None = None
+    cache_ttl: float | None = None
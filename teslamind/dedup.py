@@ -0,0 +1,145 @@
+"""Prompt deduplication.
+
+:func:`deduplicate` collapses a prompt list to its distinct prompts and
+records, for every input position, which distinct prompt stands in for
+it, so outputs computed once per distinct prompt can be fanned back out
+with :meth:`DedupPlan.expand`. With a ``threshold``, prompts whose
+estimated Jaccard similarity to an earlier prompt reaches it are folded
+into that prompt as well, using MinHash signatures over character
+shingles and locality-sensitive hashing to find candidates.
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+Signature = Tuple[int, ...]
+
+
+class MinHasher:
+    """MinHash signatures over ``shingle_size``-character shingles.
+
+    Text is lowercased and whitespace-collapsed before shingling. Two
+    signatures agree in a fraction of positions that estimates the
+    Jaccard similarity of the texts' shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, *, shingle_size: int = 5, seed: int = 0) -> None:
+        if num_perm < 1:
+            raise ValueError("num_perm must be positive")
+        if shingle_size < 1:
+            raise ValueError("shingle_size must be positive")
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, text: str) -> Set[int]:
+        normalized = " ".join(text.lower().split())
+        size = self.shingle_size
+        grams = {normalized[i : i + size] for i in range(max(1, len(normalized) - size + 1))}
+        return {
+            int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "big")
+            for gram in grams
+        }
+
+    def signature(self, text: str) -> Signature:
+        hashes = self.shingles(text)
+        return tuple(
+            min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._params
+        )
+
+
+def similarity(left: Signature, right: Signature) -> float:
+    """Return the estimated Jaccard similarity of two signatures."""
+
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+def _bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick ``(bands, rows)`` whose LSH threshold is closest to ``threshold``."""
+
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(options, key=lambda pair: abs((1 / pair[0]) ** (1 / pair[1]) - threshold))
+
+
+@dataclass(slots=True, frozen=True)
+class DedupPlan:
+    """Distinct prompts and the distinct prompt assigned to each input."""
+
+    unique: List[str]
+    assignments: List[int]
+
+    @property
+    def duplicates(self) -> int:
+        return len(self.assignments) - len(self.unique)
+
+    def members(self) -> List[List[int]]:
+        """Return the input positions represented by each distinct prompt."""
+
+        groups: List[List[int]] = [[] for _ in self.unique]
+        for position, target in enumerate(self.assignments):
+            groups[target].append(position)
+        return groups
+
+    def expand(self, outputs: Sequence[Any]) -> List[Any]:
+        """Fan per-distinct-prompt ``outputs`` back out to every input position."""
+
+        if len(outputs) != len(self.unique):
+            raise ValueError("expected one output per distinct prompt")
+        return [outputs[target] for target in self.assignments]
+
+
+def deduplicate(
+    prompts: Iterable[str],
+    *,
+    threshold: float | None = None,
+    num_perm: int = 64,
+    shingle_size: int = 5,
+    seed: int = 0,
+) -> DedupPlan:
+    """Plan evaluation of each distinct prompt once.
+
+    Identical prompts always collapse to their first occurrence. With
+    ``threshold`` (between 0 and 1), a prompt is also folded into the
+    first earlier distinct prompt whose estimated similarity is at least
+    ``threshold``. Near-duplicate detection is probabilistic; raise
+    ``num_perm`` for more accurate estimates at a higher hashing cost.
+    """
+
+    if threshold is not None and not 0 < threshold <= 1:
+        raise ValueError("threshold must be in (0, 1]")
+    seen: Dict[str, int] = {}
+    unique: List[str] = []
+    assignments: List[int] = []
+    if threshold is not None:
+        hasher = MinHasher(num_perm, shingle_size=shingle_size, seed=seed)
+        bands, rows = _bands(num_perm, threshold)
+        buckets: Dict[Tuple[int, Signature], List[int]] = {}
+        signatures: List[Signature] = []
+    for prompt in prompts:
+        target = seen.get(prompt)
+        if target is None and threshold is not None:
+            signature = hasher.signature(prompt)
+            keys = [(band, signature[band * rows : (band + 1) * rows]) for band in range(bands)]
+            candidates = sorted({index for key in keys for index in buckets.get(key, ())})
+            target = next(
+                (i for i in candidates if similarity(signature, signatures[i]) >= threshold),
+                None,
+            )
+            if target is None:
+                for key in keys:
+                    buckets.setdefault(key, []).append(len(unique))
+                signatures.append(signature)
+        if target is None:
+            target = len(unique)
+            unique.append(prompt)
+        seen[prompt] = target
+        assignments.append(target)
+    return DedupPlan(unique=unique, assignments=assignments)
@@ -0,0 +1,467 @@
+"""Multi-node federated evaluation over TCP.
+
+A :class:`Coordinator` listens on a socket and hands out chunks of
+``(index, prompt)`` items to workers, which may run on other hosts::
+
+    TESLAMIND_WORKER_TOKEN=... python -m teslamind.distributed worker \
+        --connect HOST:PORT --evaluate module:func
+
+Workers stream each output back as soon as it is computed. When a worker
+disconnects, or stays silent for longer than ``worker_timeout``, the
+items it had not answered yet are queued again for the remaining
+workers. Messages are JSON objects framed by a 4-byte big-endian length
+prefix, so prompts and outputs must be JSON serialisable.
+
+Security: the protocol is plain TCP with no encryption. When the
+coordinator is given a ``token``, a worker must present the same token
+in its ``hello`` message or it is disconnected, but the token itself
+travels in clear text. Prompts and outputs are never executed, yet any
+peer that gets past the handshake receives prompts and can feed back
+arbitrary outputs, so only expose a coordinator on a trusted network.
+"""
+from __future__ import annotations
+
+import argparse
+import hmac
+import importlib
+import json
+import os
+import secrets
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Sequence, Tuple
+
+from .exceptions import WorkerError
+from .federated import FederatedHistory, FederatedShardResult, Item
+from .instrumentation import get_instrumentation
+
+HEADER = struct.Struct(">I")
+TOKEN_ENV = "TESLAMIND_WORKER_TOKEN"
+_POLL_INTERVAL = 0.1
+Address = Tuple[str, int]
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message).encode()
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        data = sock.recv(size - len(buffer))
+        if not data:
+            raise ConnectionError("connection closed by peer")
+        buffer += data
+    return bytes(buffer)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+class _Run:
+    """Work queue and results of one :meth:`Coordinator.run` call."""
+
+    def __init__(self, prompts: Sequence[str], chunk_size: int) -> None:
+        self.total = len(prompts)
+        items = list(enumerate(prompts))
+        self.pending: Deque[List[Item]] = deque(
+            items[start : start + chunk_size] for start in range(0, self.total, chunk_size)
+        )
+        self.results: Dict[int, Any] = {}
+        self.shards: Dict[int, Dict[int, Any]] = {}
+        self.elapsed: Dict[int, float] = {}
+        self.error: str | None = None
+        self.finished = False
+        self.cond = threading.Condition()
+
+    @property
+    def complete(self) -> bool:
+        return len(self.results) == self.total
+
+    def next_chunk(self) -> List[Item] | None:
+        with self.cond:
+            self.cond.wait_for(
+                lambda: self.pending or self.finished or self.complete or self.error
+            )
+            if self.finished or self.complete or self.error:
+                return None
+            return self.pending.popleft()
+
+    def record(self, worker: int, index: int, output: Any) -> None:
+        with self.cond:
+            self.results[index] = output
+            self.shards[worker][index] = output
+            if self.complete:
+                self.cond.notify_all()
+
+    def requeue(self, items: List[Item]) -> None:
+        with self.cond:
+            self.pending.appendleft(items)
+            self.cond.notify_all()
+
+    def fail(self, message: str) -> None:
+        with self.cond:
+            self.error = message
+            self.cond.notify_all()
+
+
+class Coordinator:
+    """Serve prompt chunks to remote workers and collect their outputs.
+
+    The coordinator binds ``host``/``port`` on construction (port ``0``
+    picks a free port; see :attr:`address`), so workers can be started
+    before :meth:`run` is called. Each connected worker becomes one shard
+    of the result. ``reassigned`` counts items that were queued again
+    after their worker was lost.
+
+    With ``token``, workers whose ``hello`` message does not carry the
+    same token are disconnected before they receive any prompt. Without
+    it any peer that can reach the port may join, so leave ``host`` at
+    the loopback default unless the network is trusted.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        chunk_size: int = 8,
+        worker_timeout: float | None = None,
+        token: str | None = None,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.worker_timeout = worker_timeout
+        self.token = token
+        self.reassigned = 0
+        self.workers_lost = 0
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.1)
+        self.address: Address = self._server.getsockname()[:2]
+
+    def close(self) -> None:
+        self._server.close()
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _serve_worker(self, conn: socket.socket, worker: int, state: _Run) -> None:
+        instrumentation = get_instrumentation()
+        in_flight: Dict[int, str] = {}
+        try:
+            conn.settimeout(self.worker_timeout)
+            hello = _recv(conn)
+            if self.token is not None and not hmac.compare_digest(
+                str(hello.get("token") or ""), self.token
+            ):
+                _send(conn, {"type": "rejected", "message": "invalid worker token"})
+                instrumentation.count("distributed.workers_rejected")
+                return
+            with state.cond:
+                state.shards[worker] = {}
+                state.elapsed[worker] = 0.0
+            while True:
+                chunk = state.next_chunk()
+                if chunk is None:
+                    _send(conn, {"type": "shutdown"})
+                    return
+                in_flight = dict(chunk)
+                start = time.perf_counter()
+                _send(conn, {"type": "chunk", "items": chunk})
+                while in_flight:
+                    message = _recv(conn)
+                    if message["type"] == "error":
+                        state.fail(f"worker {worker}: {message['message']}")
+                        return
+                    del in_flight[message["index"]]
+                    state.record(worker, message["index"], message["output"])
+                elapsed = time.perf_counter() - start
+                state.elapsed[worker] += elapsed
+                instrumentation.observe("distributed.chunk_seconds", elapsed)
+        except (OSError, ValueError, KeyError):
+            with state.cond:
+                self.workers_lost += 1
+                if in_flight and not state.finished:
+                    self.reassigned += len(in_flight)
+                    state.requeue(sorted(in_flight.items()))
+            instrumentation.count("distributed.workers_lost")
+            instrumentation.count("distributed.reassigned", len(in_flight))
+        finally:
+            conn.close()
+
+    def _accept(self, state: _Run, handlers: List[threading.Thread]) -> None:
+        while not state.finished:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            worker = len(handlers)
+            handler = threading.Thread(
+                target=self._serve_worker, args=(conn, worker, state), daemon=True
+            )
+            handlers.append(handler)
+            handler.start()
+
+    def run(
+        self,
+        prompts: Iterable[str],
+        *,
+        timeout: float | None = None,
+        return_shard_results: bool = False,
+        columnar: bool = False,
+        processes: Sequence[subprocess.Popen] = (),
+    ) -> List[Any] | Tuple[List[Any], List[FederatedShardResult] | FederatedHistory]:
+        """Evaluate ``prompts`` on the connected workers.
+
+        Returns results shaped like :func:`~teslamind.federated.run_federated_evaluation`.
+        Raises :class:`~teslamind.exceptions.WorkerError` when a worker's
+        ``evaluate`` raises and :class:`TimeoutError` when the prompts are
+        not all evaluated within ``timeout`` seconds. ``processes`` are
+        local worker processes to watch: once all of them have exited and
+        no worker is connected while prompts are still pending, the run
+        stops with :class:`~teslamind.exceptions.WorkerError` instead of
+        waiting for workers that will never come.
+        """
+
+        prompts = list(prompts)
+        state = _Run(prompts, self.chunk_size)
+        handlers: List[threading.Thread] = []
+        acceptor = threading.Thread(target=self._accept, args=(state, handlers), daemon=True)
+        acceptor.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with state.cond:
+            while not (state.complete or state.error is not None):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                if processes:
+                    codes = [process.poll() for process in processes]
+                    if None not in codes and not any(h.is_alive() for h in handlers):
+                        missing = state.total - len(state.results)
+                        state.error = (
+                            f"all worker processes exited (exit codes {codes}) "
+                            f"with {missing} prompt(s) pending"
+                        )
+                        break
+                    remaining = _POLL_INTERVAL if remaining is None else min(
+                        remaining, _POLL_INTERVAL
+                    )
+                state.cond.wait(remaining)
+            state.finished = True
+            state.cond.notify_all()
+        acceptor.join()
+        for handler in handlers:
+            handler.join(timeout=1.0)
+        if state.error is not None:
+            raise WorkerError(state.error)
+        if not state.complete:
+            missing = state.total - len(state.results)
+            raise TimeoutError(f"{missing} prompt(s) were not evaluated within {timeout}s")
+
+        aggregated = [state.results[index] for index in range(state.total)]
+        if not return_shard_results:
+            return aggregated
+        shard_results: List[FederatedShardResult] | FederatedHistory = (
+            FederatedHistory() if columnar else []
+        )
+        for shard_index, worker in enumerate(sorted(state.shards)):
+            indices = sorted(state.shards[worker])
+            shard_results.append(
+                FederatedShardResult(
+                    shard_index=shard_index,
+                    prompts=tuple(prompts[index] for index in indices),
+                    outputs=tuple(state.results[index] for index in indices),
+                    elapsed=state.elapsed[worker],
+                )
+            )
+        return aggregated, shard_results
+
+
+def load_callable(spec: str) -> Callable[[str], Any]:
+    """Import ``"package.module:attribute"`` and return the attribute."""
+
+    module_name, sep, attribute = spec.partition(":")
+    if not sep or not module_name or not attribute:
+        raise ValueError(f"expected 'module:function', got {spec!r}")
+    target: Any = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def serve(
+    address: Address,
+    evaluate: Callable[[str], Any],
+    *,
+    connect_timeout: float = 10.0,
+    token: str | None = None,
+) -> int:
+    """Connect to a coordinator and evaluate chunks until told to stop.
+
+    Connection attempts are retried for ``connect_timeout`` seconds.
+    ``token`` is presented in the ``hello`` message; a coordinator that
+    rejects it makes this raise :class:`ConnectionRefusedError`.
+    Returns the number of prompts evaluated.
+    """
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection(address)
+            break
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+    processed = 0
+    with sock:
+        _send(sock, {"type": "hello", "token": token})
+        while True:
+            message = _recv(sock)
+            if message["type"] == "shutdown":
+                return processed
+            if message["type"] == "rejected":
+                raise ConnectionRefusedError(message["message"])
+            for index, prompt in message["items"]:
+                try:
+                    output = evaluate(prompt)
+                except Exception as exc:
+                    _send(sock, {"type": "error", "message": f"{type(exc).__name__}: {exc}"})
+                    raise
+                _send(sock, {"type": "output", "index": index, "output": output})
+                processed += 1
+
+
+def spawn_worker(
+    address: Address, evaluate: str, *, token: str | None = None, **popen: Any
+) -> subprocess.Popen:
+    """Start a local worker process evaluating with ``evaluate`` (``module:func``).
+
+    ``token`` is handed to the worker through the ``TESLAMIND_WORKER_TOKEN``
+    environment variable rather than the command line, where other local
+    users could read it.
+    """
+
+    if token is not None:
+        popen["env"] = {**(popen.get("env") or os.environ), TOKEN_ENV: token}
+    host, port = address
+    command = [
+        sys.executable,
+        "-m",
+        "teslamind.distributed",
+        "worker",
+        "--connect",
+        f"{host}:{port}",
+        "--evaluate",
+        evaluate,
+    ]
+    return subprocess.Popen(command, **popen)
+
+
+def run_distributed_evaluation(
+    prompts: Iterable[str],
+    evaluate: str,
+    workers: int = 2,
+    *,
+    chunk_size: int = 8,
+    timeout: float | None = None,
+    worker_timeout: float | None = None,
+    return_shard_results: bool = False,
+    columnar: bool = False,
+) -> List[Any] | Tuple[List[Any], List[FederatedShardResult] | FederatedHistory]:
+    """Evaluate ``prompts`` on ``workers`` local worker processes.
+
+    ``evaluate`` names the callable as ``"module:function"`` so that the
+    workers can import it. The coordinator listens on the loopback
+    interface and only admits workers presenting a random per-run token.
+    Raises :class:`~teslamind.exceptions.WorkerError` if every worker
+    process exits (for example because ``evaluate`` cannot be imported)
+    before all prompts are evaluated. To use workers on other hosts,
+    create a :class:`Coordinator` bound to a reachable address and start
+    ``python -m teslamind.distributed worker`` on each host instead.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    token = secrets.token_hex(16)
+    with Coordinator(
+        chunk_size=chunk_size, worker_timeout=worker_timeout, token=token
+    ) as coordinator:
+        processes = [
+            spawn_worker(coordinator.address, evaluate, token=token) for _ in range(workers)
+        ]
+        try:
+            return coordinator.run(
+                prompts,
+                timeout=timeout,
+                return_shard_results=return_shard_results,
+                columnar=columnar,
+                processes=processes,
+            )
+        finally:
+            for process in processes:
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m teslamind.distributed")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    worker = sub.add_parser("worker", help="Evaluate prompts for a coordinator")
+    worker.add_argument("--connect", required=True, metavar="HOST:PORT")
+    worker.add_argument(
+        "--evaluate",
+        required=True,
+        metavar="MODULE:FUNC",
+        help="Callable applied to each prompt, e.g. mypackage.scoring:evaluate",
+    )
+    worker.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to keep retrying the initial connection",
+    )
+    worker.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENV),
+        help=f"Shared token expected by the coordinator (default: ${TOKEN_ENV})",
+    )
+    args = parser.parse_args(argv)
+    host, sep, port = args.connect.rpartition(":")
+    if not sep or not port.isdigit():
+        parser.error("--connect must be HOST:PORT")
+    try:
+        evaluate = load_callable(args.evaluate)
+        serve(
+            (host, int(port)),
+            evaluate,
+            connect_timeout=args.connect_timeout,
+            token=args.token,
+        )
+    except ConnectionRefusedError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    except ConnectionError:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
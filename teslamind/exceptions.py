@@ -1,3 +1,11 @@
 """Custom exceptions."""
 class TeslaMindError(Exception):
     """Base error for teslamind."""
+
+
+class TransportError(TeslaMindError):
+    """Raised when an LLM transport fails to return a response."""
+
+
+class WorkerError(TeslaMindError):
+    """Raised when a distributed evaluation worker reports a failure."""
@@ -2,64 +2,525 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Iterable, List, Sequence, Tuple
+import asyncio
+import hashlib
+import heapq
+import inspect
+import json
+import os
+import queue
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
 
+from .dedup import DedupPlan, deduplicate
+from .instrumentation import get_instrumentation
 
-@dataclass
+EXECUTORS = ("serial", "thread", "process", "asyncio")
+PARTITIONS = ("round_robin", "cost")
+SCHEDULES = ("static", "work_stealing")
+CHECKPOINT_VERSION = 1
+
+Item = Tuple[int, str]
+ShardRun = Tuple[List[Item], List[Any], float]
+
+
+@dataclass(slots=True, frozen=True)
 class FederatedShardResult:
-    """Represents the evaluation results for a shard."""
+    """Represents the evaluation results for a shard.
+
+    ``elapsed`` is the wall-clock time in seconds the shard spent
+    evaluating during this run; it is ignored when comparing results.
+    """
 
     shard_index: int
     prompts: Sequence[str]
     outputs: Sequence[Any]
+    elapsed: float = field(default=0.0, compare=False)
+
+
+class FederatedHistory:
+    """Columnar (struct-of-arrays) store of :class:`FederatedShardResult` records.
+
+    Each evaluated prompt is one row: its shard index (``array("q")``),
+    prompt and output. Pass ``output_typecode`` (for example ``"d"``)
+    when outputs are numeric to keep them in a contiguous ``array`` that
+    supports zero-copy export through the buffer protocol. ``elapsed``
+    holds one timing per shard. Iterating yields one
+    :class:`FederatedShardResult` per appended shard.
+    """
+
+    __slots__ = ("shard_index", "prompts", "outputs", "elapsed", "_shard_ids", "_bounds")
+
+    def __init__(
+        self,
+        results: Iterable[FederatedShardResult] = (),
+        *,
+        output_typecode: str | None = None,
+    ) -> None:
+        self.shard_index = array("q")
+        self.prompts: List[str] = []
+        self.outputs: MutableSequence[Any] = array(output_typecode) if output_typecode else []
+        self.elapsed = array("d")
+        self._shard_ids = array("q")
+        self._bounds = array("q", [0])
+        for result in results:
+            self.append(result)
 
+    def append(self, result: FederatedShardResult) -> None:
+        self.shard_index.extend([result.shard_index] * len(result.prompts))
+        self.prompts.extend(result.prompts)
+        self.outputs.extend(result.outputs)
+        self.elapsed.append(result.elapsed)
+        self._shard_ids.append(result.shard_index)
+        self._bounds.append(len(self.prompts))
 
-def _partition(prompts: Sequence[str], shards: int) -> List[List[Tuple[int, str]]]:
-    buckets: List[List[Tuple[int, str]]] = [[] for _ in range(shards)]
+    def __len__(self) -> int:
+        return len(self._shard_ids)
+
+    def __getitem__(self, index: int) -> FederatedShardResult:
+        shard = self._shard_ids[index]
+        index %= len(self._shard_ids)
+        start, stop = self._bounds[index], self._bounds[index + 1]
+        return FederatedShardResult(
+            shard_index=shard,
+            prompts=tuple(self.prompts[start:stop]),
+            outputs=tuple(self.outputs[start:stop]),
+            elapsed=self.elapsed[index],
+        )
+
+    def __iter__(self) -> Iterator[FederatedShardResult]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def _partition(prompts: Sequence[str], shards: int) -> List[List[Item]]:
+    buckets: List[List[Item]] = [[] for _ in range(shards)]
     for idx, prompt in enumerate(prompts):
         buckets[idx % shards].append((idx, prompt))
     return buckets
 
 
+def _by_cost(prompts: Sequence[str], cost: Callable[[str], float]) -> List[Tuple[float, Item]]:
+    """Return ``(cost, (index, prompt))`` pairs from most to least expensive."""
+
+    weighted = [(cost(prompt), (index, prompt)) for index, prompt in enumerate(prompts)]
+    weighted.sort(key=lambda pair: -pair[0])
+    return weighted
+
+
+def _partition_by_cost(
+    prompts: Sequence[str], shards: int, cost: Callable[[str], float]
+) -> List[List[Item]]:
+    """Assign the most expensive prompts first, each to the least-loaded shard."""
+
+    buckets: List[List[Item]] = [[] for _ in range(shards)]
+    loads = [(0.0, shard) for shard in range(shards)]
+    for weight, item in _by_cost(prompts, cost):
+        load, shard = heapq.heappop(loads)
+        buckets[shard].append(item)
+        heapq.heappush(loads, (load + weight, shard))
+    for bucket in buckets:
+        bucket.sort()
+    return buckets
+
+
+def _checkpoint_manifest(prompts: Sequence[str], shards: int) -> Dict[str, Any]:
+    digest = hashlib.sha256(json.dumps(prompts).encode()).hexdigest()
+    return {
+        "version": CHECKPOINT_VERSION,
+        "prompts": len(prompts),
+        "shards": shards,
+        "sha256": digest,
+    }
+
+
+def _shard_log_path(directory: Path, shard_index: int) -> Path:
+    return directory / f"shard-{shard_index:05d}.jsonl"
+
+
+def _load_shard_log(path: Path) -> Dict[int, Any]:
+    """Read ``(index, output)`` lines, truncating a torn final write."""
+
+    recorded: Dict[int, Any] = {}
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return recorded
+    valid = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            index, output = json.loads(line)
+        except ValueError:
+            break
+        recorded[index] = output
+        valid += len(line)
+    if valid < len(data):
+        with path.open("r+b") as handle:
+            handle.truncate(valid)
+    return recorded
+
+
+def _prepare_checkpoint(
+    directory: Path, prompts: Sequence[str], shards: int, resume: bool
+) -> List[Dict[int, Any]]:
+    """Return the outputs already recorded by each shard in ``directory``.
+
+    Without ``resume`` (or when no checkpoint exists yet) any previous
+    shard logs are discarded and a fresh manifest is written.
+    """
+
+    manifest = _checkpoint_manifest(prompts, shards)
+    manifest_path = directory / "manifest.json"
+    if resume and manifest_path.exists():
+        if json.loads(manifest_path.read_text()) != manifest:
+            raise ValueError(
+                f"checkpoint in {directory} was written for different prompts or shard count"
+            )
+        return [_load_shard_log(_shard_log_path(directory, index)) for index in range(shards)]
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("shard-*.jsonl"):
+        stale.unlink()
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest))
+    tmp.replace(manifest_path)
+    return [{} for _ in range(shards)]
+
+
+def _open_log(path: str | None) -> ContextManager[IO[str] | None]:
+    return open(path, "a") if path is not None else nullcontext()
+
+
+def _record(log: IO[str] | None, index: int, output: Any) -> None:
+    if log is not None:
+        log.write(json.dumps([index, output]) + "\n")
+        log.flush()
+        os.fsync(log.fileno())
+
+
+@contextmanager
+def _chunk_queue(executor: str) -> Iterator[Any]:
+    """Yield a queue that every shard of ``executor`` can pull chunks from."""
+
+    if executor != "process":
+        yield queue.SimpleQueue()
+        return
+    from multiprocessing import Manager
+
+    with Manager() as manager:
+        yield manager.Queue()
+
+
+def _drain(chunks: Any) -> Iterator[Item]:
+    """Yield items from chunks taken off the shared queue until it is empty."""
+
+    while True:
+        try:
+            chunk = chunks.get_nowait()
+        except queue.Empty:
+            return
+        yield from chunk
+
+
+def _evaluate_shard(
+    evaluate: Callable[[str], Any],
+    shard_prompts: Iterable[Item],
+    log_path: str | None = None,
+) -> ShardRun:
+    start = time.perf_counter()
+    items: List[Item] = []
+    outputs: List[Any] = []
+    with _open_log(log_path) as log:
+        for index, prompt in shard_prompts:
+            output = evaluate(prompt)
+            _record(log, index, output)
+            items.append((index, prompt))
+            outputs.append(output)
+    return items, outputs, time.perf_counter() - start
+
+
+def _steal_shard(evaluate: Callable[[str], Any], chunks: Any, log_path: str | None) -> ShardRun:
+    return _evaluate_shard(evaluate, _drain(chunks), log_path)
+
+
+def _run_in_pool(
+    pool: Executor,
+    task: Callable[..., ShardRun],
+    evaluate: Callable[[str], Any],
+    sources: Sequence[Any],
+    logs: Sequence[str | None],
+) -> List[ShardRun]:
+    with pool:
+        futures = [pool.submit(task, evaluate, source, log) for source, log in zip(sources, logs)]
+        return [future.result() for future in futures]
+
+
+async def _gather_shards(
+    evaluate: Callable[[str], Awaitable[Any]],
+    sources: Sequence[Iterable[Item]],
+    logs: Sequence[str | None],
+    max_workers: int | None,
+) -> List[ShardRun]:
+    limit = asyncio.Semaphore(max_workers or len(sources) or 1)
+
+    async def run_shard(shard: Iterable[Item], log_path: str | None) -> ShardRun:
+        async with limit:
+            start = time.perf_counter()
+            items: List[Item] = []
+            outputs: List[Any] = []
+            with _open_log(log_path) as log:
+                for index, prompt in shard:
+                    output = evaluate(prompt)
+                    if inspect.isawaitable(output):
+                        output = await output
+                    _record(log, index, output)
+                    items.append((index, prompt))
+                    outputs.append(output)
+            return items, outputs, time.perf_counter() - start
+
+    return list(
+        await asyncio.gather(*(run_shard(shard, log) for shard, log in zip(sources, logs)))
+    )
+
+
+def _run_shards(
+    evaluate: Callable[[str], Any],
+    sources: Sequence[Any],
+    logs: Sequence[str | None],
+    executor: str,
+    max_workers: int | None,
+    task: Callable[..., ShardRun] = _evaluate_shard,
+) -> List[ShardRun]:
+    """Run ``task(evaluate, source, log)`` for every shard on ``executor``.
+
+    A source is either the shard's list of items or, for the process
+    executor under work stealing, the shared chunk queue.
+    """
+
+    if executor == "serial":
+        return [task(evaluate, source, log) for source, log in zip(sources, logs)]
+    if executor == "thread":
+        pool: Executor = ThreadPoolExecutor(max_workers=max_workers or len(sources))
+        return _run_in_pool(pool, task, evaluate, sources, logs)
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        return _run_in_pool(pool, task, evaluate, sources, logs)
+    return asyncio.run(_gather_shards(evaluate, sources, logs, max_workers))
+
+
+def _run_work_stealing(
+    evaluate: Callable[[str], Any],
+    items: Sequence[Item],
+    logs: Sequence[str | None],
+    executor: str,
+    max_workers: int | None,
+    chunk_size: int,
+) -> List[ShardRun]:
+    with _chunk_queue(executor) as chunks:
+        for start in range(0, len(items), chunk_size):
+            chunks.put(list(items[start : start + chunk_size]))
+        if executor == "process":
+            sources: List[Any] = [chunks] * len(logs)
+            return _run_shards(evaluate, sources, logs, executor, max_workers, _steal_shard)
+        sources = [_drain(chunks) for _ in logs]
+        return _run_shards(evaluate, sources, logs, executor, max_workers)
+
+
+def _expand_shards(
+    plan: DedupPlan,
+    prompts: Sequence[str],
+    aggregated: Sequence[Any],
+    unique_shards: Iterable[FederatedShardResult],
+    columnar: bool,
+) -> List[FederatedShardResult] | FederatedHistory:
+    """Rebuild shard records so each covers every input its prompts stand for."""
+
+    position = {prompt: index for index, prompt in enumerate(plan.unique)}
+    members = plan.members()
+    shard_results: List[FederatedShardResult] | FederatedHistory = (
+        FederatedHistory() if columnar else []
+    )
+    for shard in unique_shards:
+        indices = sorted(index for prompt in shard.prompts for index in members[position[prompt]])
+        shard_results.append(
+            FederatedShardResult(
+                shard_index=shard.shard_index,
+                prompts=tuple(prompts[index] for index in indices),
+                outputs=tuple(aggregated[index] for index in indices),
+                elapsed=shard.elapsed,
+            )
+        )
+    return shard_results
+
+
 def run_federated_evaluation(
     prompts: Iterable[str],
     evaluate: Callable[[str], Any],
     shards: int = 1,
     *,
     return_shard_results: bool = False,
-) -> List[Any] | Tuple[List[Any], List[FederatedShardResult]]:
+    executor: str = "serial",
+    max_workers: int | None = None,
+    columnar: bool = False,
+    checkpoint_dir: str | Path | None = None,
+    resume: bool = False,
+    partition: str = "round_robin",
+    cost: Callable[[str], float] | None = None,
+    schedule: str = "static",
+    chunk_size: int | None = None,
+    dedup: bool = False,
+    dedup_threshold: float | None = None,
+) -> List[Any] | Tuple[List[Any], List[FederatedShardResult] | FederatedHistory]:
     """Run evaluations across logical shards.
 
     When ``return_shard_results`` is true, returns both the aggregated
     results and a list of :class:`FederatedShardResult` records for
-    transparency.
+    transparency, stored in a :class:`FederatedHistory` when ``columnar``
+    is true. Each record's ``elapsed`` reports how long the shard spent
+    evaluating.
+
+    ``executor`` selects how shards are run: ``"serial"`` (default) runs
+    them one after another, ``"thread"`` uses a thread pool for I/O-bound
+    callables, ``"process"`` uses a process pool for CPU-bound callables
+    (``evaluate`` must be picklable) and ``"asyncio"`` awaits coroutine
+    ``evaluate`` callables on a fresh event loop. ``max_workers`` bounds
+    the number of shards in flight at once; by default every shard may
+    run concurrently (or ``os.cpu_count()`` for the process pool).
+
+    ``partition`` controls how prompts are assigned to shards:
+    ``"round_robin"`` (default) deals them out in turn, while ``"cost"``
+    balances the estimated total cost per shard, using ``cost(prompt)``
+    (default: prompt length) and placing the most expensive prompts
+    first. With ``schedule="work_stealing"`` shards are not fixed up
+    front; prompts are queued in chunks of ``chunk_size`` (by cost when
+    ``partition="cost"``) and each shard pulls the next chunk as soon as
+    it is idle, so a slow shard no longer holds up the run.
+
+    With ``checkpoint_dir``, every ``(original_index, output)`` pair is
+    appended to a per-shard JSON Lines log and fsynced as soon as it is
+    produced, so outputs must be JSON serialisable. Passing ``resume=True``
+    reloads the recorded outputs and evaluates only the remaining prompts;
+    a :class:`ValueError` is raised if the checkpoint was written for a
+    different prompt list or shard count. Resumed outputs are the JSON
+    round-tripped values (tuples come back as lists).
+
+    With ``dedup``, each distinct prompt is evaluated once and its output
+    is copied to every position where it occurs; shard results still
+    list every input prompt. ``dedup_threshold`` additionally folds
+    near-duplicates (see :func:`teslamind.dedup.deduplicate`) into the
+    first similar prompt, which then supplies their output.
     """
 
     prompts = list(prompts)
     if shards < 1:
         raise ValueError("shards must be positive")
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}")
+    if partition not in PARTITIONS:
+        raise ValueError(f"partition must be one of {', '.join(PARTITIONS)}")
+    if schedule not in SCHEDULES:
+        raise ValueError(f"schedule must be one of {', '.join(SCHEDULES)}")
+    if cost is not None and partition != "cost":
+        raise ValueError("cost requires partition='cost'")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be positive")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if resume and checkpoint_dir is None:
+        raise ValueError("resume requires checkpoint_dir")
+    if dedup_threshold is not None and not dedup:
+        raise ValueError("dedup_threshold requires dedup=True")
 
-    partitions = _partition(prompts, shards)
-    aggregated_with_index: List[Tuple[int, Any]] = []
-    shard_results: List[FederatedShardResult] = []
-    for shard_index, shard_prompts in enumerate(partitions):
-        outputs: List[Any] = []
-        raw_prompts: List[str] = []
-        for original_index, prompt in shard_prompts:
-            output = evaluate(prompt)
-            outputs.append(output)
-            raw_prompts.append(prompt)
-            aggregated_with_index.append((original_index, output))
+    instrumentation = get_instrumentation()
+    if dedup:
+        plan = deduplicate(prompts, threshold=dedup_threshold)
+        instrumentation.count("federated.duplicates", plan.duplicates, executor=executor)
+        unique_results, unique_shards = run_federated_evaluation(
+            plan.unique,
+            evaluate,
+            shards,
+            return_shard_results=True,
+            executor=executor,
+            max_workers=max_workers,
+            checkpoint_dir=checkpoint_dir,
+            resume=resume,
+            partition=partition,
+            cost=cost,
+            schedule=schedule,
+            chunk_size=chunk_size,
+        )
+        aggregated = plan.expand(unique_results)
+        if not return_shard_results:
+            return aggregated
+        return aggregated, _expand_shards(plan, prompts, aggregated, unique_shards, columnar)
+
+    recorded: List[Dict[int, Any]] = [{} for _ in range(shards)]
+    logs: List[str | None] = [None] * shards
+    if checkpoint_dir is not None:
+        directory = Path(checkpoint_dir)
+        recorded = _prepare_checkpoint(directory, prompts, shards, resume)
+        logs = [str(_shard_log_path(directory, index)) for index in range(shards)]
+    completed: Dict[int, Any] = {}
+    for shard_outputs in recorded:
+        completed.update(shard_outputs)
+    if checkpoint_dir is not None:
+        instrumentation.count("federated.resumed", len(completed), executor=executor)
+
+    cost = cost or len
+    with instrumentation.span("federated.evaluation_seconds", executor=executor):
+        if schedule == "work_stealing":
+            if partition == "cost":
+                ordered = [item for _, item in _by_cost(prompts, cost)]
+            else:
+                ordered = list(enumerate(prompts))
+            items = [item for item in ordered if item[0] not in completed]
+            size = chunk_size or max(1, len(items) // (shards * 4))
+            runs = _run_work_stealing(evaluate, items, logs, executor, max_workers, size)
+        else:
+            if partition == "cost":
+                partitions = _partition_by_cost(prompts, shards, cost)
+            else:
+                partitions = _partition(prompts, shards)
+            pending = [[item for item in shard if item[0] not in completed] for shard in partitions]
+            runs = _run_shards(evaluate, pending, logs, executor, max_workers)
+
+    shard_results: List[FederatedShardResult] | FederatedHistory = (
+        FederatedHistory() if columnar else []
+    )
+    for shard_index, ((items, outputs, elapsed), previous) in enumerate(zip(runs, recorded)):
+        instrumentation.observe("federated.shard_seconds", elapsed, executor=executor)
+        instrumentation.count("federated.prompts", len(items), executor=executor)
+        completed.update(zip((index for index, _ in items), outputs))
+        indices = sorted([*previous, *(index for index, _ in items)])
         shard_results.append(
             FederatedShardResult(
                 shard_index=shard_index,
-                prompts=tuple(raw_prompts),
-                outputs=tuple(outputs),
+                prompts=tuple(prompts[index] for index in indices),
+                outputs=tuple(completed[index] for index in indices),
+                elapsed=elapsed,
             )
         )
 
-    aggregated = [output for _, output in sorted(aggregated_with_index, key=lambda item: item[0])]
+    aggregated = [completed[index] for index in range(len(prompts))]
     if return_shard_results:
         return aggregated, shard_results
     return aggregated
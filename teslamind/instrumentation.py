@@ -0,0 +1,213 @@
+"""Lightweight instrumentation hooks.
+
+Hot paths report spans (timed blocks), counters and histogram
+observations to the active :class:`Instrumentation`. The default is a
+no-op whose methods do nothing, so instrumentation costs one method call
+when disabled. Install an :class:`Aggregator` with
+:func:`set_instrumentation` to collect metrics in-process and export them
+as JSON or Prometheus text.
+"""
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Dict, Iterator, List, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+)
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, tags: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((key, str(value)) for key, value in tags.items()))
+
+
+class Instrumentation:
+    """No-op instrumentation; subclasses record what they receive."""
+
+    enabled = False
+
+    def span(self, name: str, **tags: Any) -> ContextManager[None]:
+        """Time the enclosed block as an observation of ``name`` in seconds."""
+
+        return _NULL_SPAN
+
+    def count(self, name: str, value: float = 1, **tags: Any) -> None:
+        """Increment counter ``name`` by ``value``."""
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        """Record ``value`` in histogram ``name``."""
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram compatible with Prometheus."""
+
+    bounds: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class Aggregator(Instrumentation):
+    """Thread-safe in-process metrics store."""
+
+    enabled = True
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _timed(self, name: str, tags: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **tags)
+
+    def span(self, name: str, **tags: Any) -> ContextManager[None]:
+        return self._timed(name, tags)
+
+    def count(self, name: str, value: float = 1, **tags: Any) -> None:
+        key = _key(name, tags)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **tags: Any) -> None:
+        key = _key(name, tags)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.add(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "tags": dict(tags), "value": value}
+                    for (name, tags), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {
+                        "name": name,
+                        "tags": dict(tags),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "mean": h.mean,
+                        "min": h.min if h.count else None,
+                        "max": h.max if h.count else None,
+                        "buckets": dict(zip(map(str, h.bounds), h.counts)),
+                        "overflow": h.counts[-1],
+                    }
+                    for (name, tags), h in sorted(self.histograms.items())
+                ],
+            }
+
+    def to_json(self, **dumps_options: Any) -> str:
+        return json.dumps(self.to_dict(), **dumps_options)
+
+    def to_prometheus(self, prefix: str = "teslamind_") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        typed = set()
+        for (name, tags), value in counters:
+            metric = _metric_name(prefix, name) + "_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(tags)} {value:g}")
+        for (name, tags), histogram in histograms:
+            metric = _metric_name(prefix, name)
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(tags, le=f'{bound:g}')} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(tags, le='+Inf')} {histogram.count}")
+            lines.append(f"{metric}_sum{_labels(tags)} {histogram.sum:g}")
+            lines.append(f"{metric}_count{_labels(tags)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", prefix + name)
+
+
+def _labels(tags: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    pairs = list(tags) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_ACTIVE: Instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Return the active instrumentation (a no-op by default)."""
+
+    return _ACTIVE
+
+
+def set_instrumentation(instrumentation: Instrumentation | None) -> Instrumentation:
+    """Install ``instrumentation`` (``None`` restores the no-op) and return the previous one."""
+
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = instrumentation if instrumentation is not None else Instrumentation()
+    return previous
@@ -1,5 +1,10 @@
-"""Logging utilities."""
+"""Logging utilities.
+
+The package logger only carries a :class:`logging.NullHandler`;
+applications decide how records are emitted, for example with
+``logging.basicConfig(level=logging.INFO)``.
+"""
 import logging
 
 logger = logging.getLogger("teslamind")
-logging.basicConfig(level=logging.INFO)
+logger.addHandler(logging.NullHandler())
@@ -1,6 +1,110 @@
-"""Simple scoring utilities."""
+"""Simple scoring utilities.
+
+:func:`length_score` scores a single response. :func:`score_batch` scores
+many responses against several rubrics in one pass and returns one
+column per rubric: a NumPy ``float64`` array when NumPy is installed,
+otherwise an :class:`array.array` of doubles.
+"""
+from __future__ import annotations
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, Sequence
+
 from .models.score import Score
 
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+RUBRICS = ("length", "tokens", "diversity", "alignment")
+TESLA_KEYWORDS = frozenset(
+    {"energy", "invention", "innovation", "vision", "electric", "experiment", "tesla"}
+)
+_WORD_RE = re.compile(r"\w+")
+_BLOCK_SIZE = 8192
+
 
 def length_score(text: str) -> Score:
     return Score(value=len(text), rubric="length")
+
+
+def _column(values: array) -> Any:
+    if np is not None:
+        return np.frombuffer(values, dtype=np.float64)
+    return values
+
+
+def _ratio(numerators: array, denominators: array) -> Any:
+    """Element-wise ``numerators / denominators`` with 0 where the denominator is 0."""
+
+    if np is not None:
+        num = np.frombuffer(numerators, dtype=np.float64)
+        den = np.frombuffer(denominators, dtype=np.float64)
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+    return array("d", (n / d if d else 0.0 for n, d in zip(numerators, denominators)))
+
+
+def score_batch(
+    responses: Sequence[str],
+    rubrics: Iterable[str] = RUBRICS,
+    *,
+    keywords: Iterable[str] = TESLA_KEYWORDS,
+) -> Dict[str, Any]:
+    """Score ``responses`` against several rubrics at once.
+
+    Rubrics:
+
+    ``length``
+        Number of characters.
+    ``tokens``
+        Number of word tokens.
+    ``diversity``
+        Distinct words divided by total words (0 for empty responses).
+    ``alignment``
+        Fraction of ``keywords`` present in the response.
+
+    Responses are processed in blocks with ``map`` chains over built-in
+    functions (lowercasing, one regex ``findall``, ``set`` and
+    ``len``), so no Python-level code runs per response; counts are
+    collected into contiguous ``array("d")`` buffers and the ratios are
+    computed as vectorised NumPy operations when NumPy is available.
+    Each response is tokenized at most once regardless of how many
+    rubrics are requested.
+    """
+
+    rubrics = tuple(rubrics)
+    unknown = set(rubrics) - set(RUBRICS)
+    if unknown:
+        raise ValueError(f"unknown rubric(s): {', '.join(sorted(unknown))}")
+
+    keyword_set = frozenset(keyword.lower() for keyword in keywords)
+    needs_words = any(rubric != "length" for rubric in rubrics)
+    needs_sets = "diversity" in rubrics or "alignment" in rubrics
+    lengths, tokens, distinct, hits = array("d"), array("d"), array("d"), array("d")
+    for start in range(0, len(responses), _BLOCK_SIZE):
+        block = responses[start : start + _BLOCK_SIZE]
+        if "length" in rubrics:
+            lengths.extend(map(len, block))
+        if not needs_words:
+            continue
+        words = list(map(_WORD_RE.findall, map(str.lower, block)))
+        tokens.extend(map(len, words))
+        if needs_sets:
+            sets = list(map(set, words))
+            distinct.extend(map(len, sets))
+            hits.extend(map(len, map(keyword_set.intersection, sets)))
+
+    columns: Dict[str, Any] = {}
+    for rubric in rubrics:
+        if rubric == "length":
+            columns[rubric] = _column(lengths)
+        elif rubric == "tokens":
+            columns[rubric] = _column(tokens)
+        elif rubric == "diversity":
+            columns[rubric] = _ratio(distinct, tokens)
+        else:
+            scale = array("d", [float(len(keyword_set))]) * len(hits)
+            columns[rubric] = _ratio(hits, scale)
+    return columns
@@ -1,7 +1,7 @@
 """Prompt metadata model."""
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class PromptMeta:
     title: str
     version: str
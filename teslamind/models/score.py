@@ -1,7 +1,7 @@
 """Score model."""
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Score:
     value: float
     rubric: str
@@ -1,7 +1,7 @@
 """Session model."""
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     id: str
     user_id: str
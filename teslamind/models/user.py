@@ -1,7 +1,7 @@
 """User model."""
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: str
     name: str
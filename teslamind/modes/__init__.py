@@ -1,4 +1,5 @@
 """Prompt modes."""
+from . import coop, energy, hyperscience, invention, patent, visionary
 from .energy import energy_prompt
 from .patent import patent_prompt
 from .invention import invention_prompt
@@ -6,7 +7,17 @@ from .visionary import visionary_prompt
 from .hyperscience import hyperscience_prompt
 from .coop import coop_prompt
 
+MODE_PREFIXES = {
+    "energy": energy.PREFIX,
+    "patent": patent.PREFIX,
+    "invention": invention.PREFIX,
+    "visionary": visionary.PREFIX,
+    "hyperscience": hyperscience.PREFIX,
+    "coop": coop.PREFIX,
+}
+
 __all__ = [
+    "MODE_PREFIXES",
     "energy_prompt",
     "patent_prompt",
     "invention_prompt",
@@ -1,4 +1,7 @@
 """Collaboration mode."""
 
+PREFIX = "[Cooperative Mode]"
+
+
 def coop_prompt(task: str) -> str:
-    return f"[Cooperative Mode] {task}"
+    return f"{PREFIX} {task}"
@@ -1,4 +1,7 @@
 """Energy mode prompts."""
 
+PREFIX = "[Energy Mode]"
+
+
 def energy_prompt(task: str) -> str:
-    return f"[Energy Mode] {task}"
+    return f"{PREFIX} {task}"
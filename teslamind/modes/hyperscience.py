@@ -1,4 +1,7 @@
 """Hyperscience mode."""
 
+PREFIX = "[Hyperscience Mode]"
+
+
 def hyperscience_prompt(task: str) -> str:
-    return f"[Hyperscience Mode] {task}"
+    return f"{PREFIX} {task}"
@@ -1,4 +1,7 @@
 """Invention mode."""
 
+PREFIX = "[Invention Mode]"
+
+
 def invention_prompt(task: str) -> str:
-    return f"[Invention Mode] {task}"
+    return f"{PREFIX} {task}"
@@ -1,4 +1,7 @@
 """Patent mode."""
 
+PREFIX = "[Patent Mode]"
+
+
 def patent_prompt(task: str) -> str:
-    return f"[Patent Mode] {task}"
+    return f"{PREFIX} {task}"
@@ -1,4 +1,7 @@
 """Visionary mode."""
 
+PREFIX = "[Visionary Mode]"
+
+
 def visionary_prompt(task: str) -> str:
-    return f"[Visionary Mode] {task}"
+    return f"{PREFIX} {task}"
@@ -7,3 +7,8 @@ class Persona:
 
     name: str
     description: str
+
+    def as_prompt(self) -> str:
+        """Return the persona as a sentence suitable for a system prompt."""
+
+        return f"Act as {self.name}: {self.description}."
@@ -2,17 +2,57 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, List, Tuple
+import hashlib
+import threading
+import time
+import types
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Sequence, Tuple, Union
 
+from .cache import LRUCache
+from .instrumentation import get_instrumentation
 
-@dataclass
+Candidate = Tuple[str, bool]
+RefineResult = Union[Candidate, Sequence[Candidate]]
+
+
+@dataclass(slots=True, frozen=True)
+class RefinementNode:
+    """A prompt explored during a beam refinement run."""
+
+    index: int
+    parent: int | None
+    depth: int
+    prompt: str
+    score: float
+
+
+@dataclass(slots=True)
 class RefinementHistory:
-    """History of a refinement run."""
+    """History of a refinement run.
+
+    ``nodes`` is only populated by :meth:`SelfLoopingPromptGenerator.generate_beam`
+    and records every explored candidate with a link to its parent.
+    """
 
     steps: List[str]
     iterations: int
     stopped_reason: str
+    nodes: List[RefinementNode] = field(default_factory=list)
+
+
+def _candidates(result: RefineResult) -> List[Candidate]:
+    # A single pair's flag may be any truthy value (an int, a numpy bool), so
+    # only a nested sequence in the second slot marks a list of candidates.
+    if (
+        len(result) == 2
+        and isinstance(result[0], str)
+        and not isinstance(result[1], (str, Sequence))
+    ):
+        return [(result[0], bool(result[1]))]
+    return [(text, bool(improved)) for text, improved in result]  # type: ignore[misc, str-unpack]
 
 
 class SelfLoopingPromptGenerator:
@@ -20,10 +60,74 @@ class SelfLoopingPromptGenerator:
 
     The generator records intermediate prompts so that callers can
     inspect how a prompt evolved over time.
+
+    Memoisation is opt-in: with ``memo_size`` set, results of
+    ``refine_func`` are cached by a hash of the prompt in a bounded LRU
+    cache of ``memo_size`` entries, shared by every ``generate`` call on
+    this instance that passes the same callable object, so overlapping
+    refinement jobs do not repeat calls. Only enable it for refiners that
+    are deterministic for a given prompt. Caches are held weakly by
+    callable (by instance and function for bound methods, which are
+    recreated on every attribute access), so memoising a closure or an
+    object's method does not keep it alive; callables that cannot be
+    weakly referenced are not memoised.
     """
 
-    def __init__(self, max_iters: int = 5) -> None:
+    def __init__(self, max_iters: int = 5, *, memo_size: int = 0) -> None:
+        if memo_size < 0:
+            raise ValueError("memo_size must not be negative")
         self.max_iters = max_iters
+        self.memo_size = memo_size
+        self._memos: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._memos_lock = threading.Lock()
+
+    def _memo(self, refine_func: Callable[[str], Any]) -> LRUCache | None:
+        if not self.memo_size:
+            return None
+        owner: Any = refine_func
+        member: Any = None
+        if isinstance(refine_func, types.MethodType):
+            owner, member = refine_func.__self__, refine_func.__func__
+        with self._memos_lock:
+            try:
+                memos = self._memos.get(owner)
+                if memos is None:
+                    memos = self._memos[owner] = {}
+            except TypeError:
+                return None
+            memo = memos.get(member)
+            if memo is None:
+                memo = memos[member] = LRUCache(max_entries=self.memo_size)
+        return memo
+
+    def _lookup(
+        self, refine_func: Callable[[str], Any], prompt: str
+    ) -> Tuple[LRUCache | None, str, Any]:
+        """Return ``(memo, key, cached_result_or_None)`` for ``prompt``."""
+
+        memo = self._memo(refine_func)
+        if memo is None:
+            return None, "", None
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        result = memo.get(key)
+        if result is not None:
+            get_instrumentation().count("refinement.memo_hits")
+        return memo, key, result
+
+    def _call(
+        self, refine_func: Callable[[str], Any], prompt: str, memo: LRUCache | None, key: str
+    ) -> Any:
+        with get_instrumentation().span("refinement.refine_seconds"):
+            result = refine_func(prompt)
+        if memo is not None:
+            memo.set(key, result)
+        return result
+
+    def _refine(self, refine_func: Callable[[str], Any], prompt: str) -> Any:
+        memo, key, result = self._lookup(refine_func, prompt)
+        if result is None:
+            result = self._call(refine_func, prompt, memo, key)
+        return result
 
     def generate(
         self,
@@ -31,6 +135,8 @@ class SelfLoopingPromptGenerator:
         refine_func: Callable[[str], Tuple[str, bool]],
         *,
         return_history: bool = False,
+        max_calls: int | None = None,
+        time_budget: float | None = None,
     ) -> str | Tuple[str, RefinementHistory]:
         """Run the self-looping refinement process.
 
@@ -44,18 +150,45 @@ class SelfLoopingPromptGenerator:
         return_history:
             When true, return a :class:`RefinementHistory` alongside the
             final prompt.
+        max_calls:
+            Maximum number of uncached ``refine_func`` calls; ``0``
+            makes no calls.
+        time_budget:
+            Wall-clock budget in seconds.
+
+        The run stops with ``stopped_reason`` set to ``"cycle"`` when a
+        prompt repeats and to ``"budget"`` when an uncached call would
+        exceed ``max_calls`` or start after ``time_budget`` has elapsed.
         """
 
         steps = [prompt]
+        seen = {prompt}
         last_reason = "max_iters"
-        for iteration in range(1, self.max_iters + 1):
-            prompt, improved = refine_func(prompt)
+        calls = 0
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        iteration = 0
+        instrumentation = get_instrumentation()
+        while iteration < self.max_iters:
+            memo, key, result = self._lookup(refine_func, prompt)
+            if result is None:
+                if (max_calls is not None and calls >= max_calls) or (
+                    deadline is not None and time.monotonic() >= deadline
+                ):
+                    last_reason = "budget"
+                    break
+                result = self._call(refine_func, prompt, memo, key)
+                calls += 1
+            iteration += 1
+            instrumentation.count("refinement.iterations")
+            prompt, improved = result
             steps.append(prompt)
             if not improved:
                 last_reason = "no_improvement"
                 break
-        else:
-            iteration = self.max_iters
+            if prompt in seen:
+                last_reason = "cycle"
+                break
+            seen.add(prompt)
 
         if return_history:
             history = RefinementHistory(
@@ -65,3 +198,86 @@ class SelfLoopingPromptGenerator:
             )
             return prompt, history
         return prompt
+
+    def generate_beam(
+        self,
+        prompt: str,
+        refine_func: Callable[[str], RefineResult],
+        score_func: Callable[[str], float],
+        *,
+        beam_width: int = 3,
+        max_workers: int | None = None,
+        return_history: bool = False,
+    ) -> str | Tuple[str, RefinementHistory]:
+        """Refine a population of prompts with beam search.
+
+        Parameters
+        ----------
+        prompt:
+            Starting prompt text.
+        refine_func:
+            Callable returning either one ``(prompt, improved)`` pair or a
+            sequence of them. Candidates flagged as not improved are
+            discarded.
+        score_func:
+            Callable scoring a prompt; higher is better.
+        beam_width:
+            Number of candidates kept at each depth.
+        max_workers:
+            Size of the thread pool used to refine and score the beam
+            concurrently. Defaults to ``beam_width``.
+        return_history:
+            When true, return a :class:`RefinementHistory` whose ``nodes``
+            record the explored tree and whose ``steps`` trace the path to
+            the best prompt.
+        """
+
+        if beam_width < 1:
+            raise ValueError("beam_width must be positive")
+        nodes = [RefinementNode(0, None, 0, prompt, score_func(prompt))]
+        beam = [nodes[0]]
+        best = nodes[0]
+        last_reason = "max_iters"
+        iterations = 0
+        with ThreadPoolExecutor(max_workers=max_workers or beam_width) as pool:
+            for depth in range(1, self.max_iters + 1):
+                refined = pool.map(
+                    lambda text: self._refine(refine_func, text),
+                    [node.prompt for node in beam],
+                )
+                seen = set()
+                children: List[Tuple[RefinementNode, str]] = []
+                for parent, result in zip(beam, refined):
+                    for text, improved in _candidates(result):
+                        if improved and text not in seen:
+                            seen.add(text)
+                            children.append((parent, text))
+                iterations = depth
+                get_instrumentation().count("refinement.iterations")
+                if not children:
+                    last_reason = "no_improvement"
+                    break
+                scores = list(pool.map(score_func, [text for _, text in children]))
+                layer = []
+                for (parent, text), score in zip(children, scores):
+                    child = RefinementNode(len(nodes), parent.index, depth, text, score)
+                    nodes.append(child)
+                    layer.append(child)
+                beam = sorted(layer, key=lambda node: node.score, reverse=True)[:beam_width]
+                if beam[0].score > best.score:
+                    best = beam[0]
+
+        if return_history:
+            steps: List[str] = []
+            node: RefinementNode | None = best
+            while node is not None:
+                steps.append(node.prompt)
+                node = nodes[node.parent] if node.parent is not None else None
+            history = RefinementHistory(
+                steps=steps[::-1],
+                iterations=iterations,
+                stopped_reason=last_reason,
+                nodes=nodes,
+            )
+            return best.prompt, history
+        return best.prompt
@@ -2,11 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Iterable, List, Tuple
+import json
+from array import array
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
+from .dedup import deduplicate
+from .instrumentation import get_instrumentation
 
-@dataclass
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(slots=True, frozen=True)
 class RLHFResult:
     """Container for the outcome of a single RLHF step."""
 
@@ -15,12 +37,209 @@ class RLHFResult:
     reward: float
 
 
+class RLHFHistory:
+    """Columnar (struct-of-arrays) store of :class:`RLHFResult` records.
+
+    Prompts and feedback are kept in lists and rewards in a contiguous
+    ``array("d")``, so large histories avoid one object per record.
+    ``rewards`` supports the buffer protocol for zero-copy export, e.g.
+    ``numpy.frombuffer(history.rewards)``; release such views before
+    appending more results. Instances are callable, so they can be passed
+    directly as an :meth:`RLHFTrainer.iter_train` sink.
+    """
+
+    __slots__ = ("prompts", "feedback", "rewards")
+
+    def __init__(self, results: Iterable[RLHFResult] = ()) -> None:
+        self.prompts: List[str] = []
+        self.feedback: List[str] = []
+        self.rewards = array("d")
+        for result in results:
+            self.append(result)
+
+    def append(self, result: RLHFResult) -> None:
+        self.prompts.append(result.prompt)
+        self.feedback.append(result.feedback)
+        self.rewards.append(result.reward)
+
+    __call__ = append
+
+    def __len__(self) -> int:
+        return len(self.rewards)
+
+    def __getitem__(self, index: int) -> RLHFResult:
+        return RLHFResult(self.prompts[index], self.feedback[index], self.rewards[index])
+
+    def __iter__(self) -> Iterator[RLHFResult]:
+        for prompt, feedback, reward in zip(self.prompts, self.feedback, self.rewards):
+            yield RLHFResult(prompt, feedback, reward)
+
+
+@dataclass
+class RewardStats:
+    """Running reward statistics kept in constant memory."""
+
+    count: int = 0
+    mean: float = 0.0
+    passed: int = 0
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.count if self.count else 0.0
+
+    def update(self, reward: float, passed: bool) -> None:
+        self.count += 1
+        self.mean += (reward - self.mean) / self.count
+        self.passed += passed
+
+
+class JSONLSink:
+    """Append :class:`RLHFResult` records to a JSON Lines file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._handle: IO[str] = Path(path).open("a")
+
+    def __call__(self, result: RLHFResult) -> None:
+        self._handle.write(json.dumps(asdict(result)) + "\n")
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "JSONLSink":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def batched(func: F) -> F:
+    """Declare that ``func`` accepts lists instead of single items.
+
+    A batched feedback provider maps ``List[str]`` prompts to a list of
+    feedback strings; a batched reward function maps ``(prompts,
+    feedbacks)`` lists to a list of rewards. Callables may also opt in by
+    exposing a truthy ``batched`` attribute.
+    """
+
+    func.batched = True  # type: ignore[attr-defined]
+    return func
+
+
+def _is_batched(func: Callable[..., Any]) -> bool:
+    return bool(getattr(func, "batched", False))
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
 class RLHFTrainer:
-    """Simple RLHF training loop stub with thresholding."""
+    """Simple RLHF training loop stub with thresholding.
+
+    Prompts are processed in chunks of ``batch_size``. Feedback providers
+    and reward functions marked with :func:`batched` receive a whole chunk
+    per call; others are called once per prompt. With ``max_workers``
+    greater than one, feedback for up to that many chunks is gathered
+    concurrently on a thread pool. Output order always matches the input.
+    """
 
-    def __init__(self, reward_func: Callable[[str, str], float], threshold: float = 0.0):
+    def __init__(
+        self,
+        reward_func: Callable[[str, str], float],
+        threshold: float = 0.0,
+        *,
+        batch_size: int = 1,
+        max_workers: int | None = None,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be positive")
         self.reward_func = reward_func
         self.threshold = threshold
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _feedback(feedback_provider: Callable[..., Any], chunk: List[str]) -> List[str]:
+        with get_instrumentation().span("rlhf.feedback_seconds"):
+            if _is_batched(feedback_provider):
+                feedback = list(feedback_provider(chunk))
+                if len(feedback) != len(chunk):
+                    raise ValueError(
+                        "batched feedback provider returned the wrong number of items"
+                    )
+                return feedback
+            return [feedback_provider(prompt) for prompt in chunk]
+
+    def _rewards(self, chunk: Sequence[str], feedback: Sequence[str]) -> List[float]:
+        if _is_batched(self.reward_func):
+            batch_reward: Callable[..., Any] = self.reward_func
+            rewards = list(batch_reward(list(chunk), list(feedback)))
+            if len(rewards) != len(chunk):
+                raise ValueError("batched reward function returned the wrong number of items")
+            return rewards
+        return [self.reward_func(prompt, item) for prompt, item in zip(chunk, feedback)]
+
+    def _iter_feedback(
+        self, prompts: Iterable[str], feedback_provider: Callable[..., Any]
+    ) -> Iterator[Tuple[List[str], List[str]]]:
+        chunks = _chunked(prompts, self.batch_size)
+        if self.max_workers is None or self.max_workers == 1:
+            for chunk in chunks:
+                yield chunk, self._feedback(feedback_provider, chunk)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            window: Deque[Tuple[List[str], Future]] = deque()
+            for chunk in chunks:
+                window.append((chunk, pool.submit(self._feedback, feedback_provider, chunk)))
+                if len(window) >= self.max_workers:
+                    done, future = window.popleft()
+                    yield done, future.result()
+            while window:
+                done, future = window.popleft()
+                yield done, future.result()
+
+    def _iter_results(
+        self, prompts: Iterable[str], feedback_provider: Callable[..., Any]
+    ) -> Iterator[RLHFResult]:
+        instrumentation = get_instrumentation()
+        for chunk, feedback in self._iter_feedback(prompts, feedback_provider):
+            with instrumentation.span("rlhf.reward_seconds"):
+                rewards = self._rewards(chunk, feedback)
+            instrumentation.count("rlhf.batches")
+            instrumentation.count("rlhf.prompts", len(chunk))
+            for prompt, item, reward in zip(chunk, feedback, rewards):
+                yield RLHFResult(prompt=prompt, feedback=item, reward=reward)
+
+    def iter_train(
+        self,
+        prompts: Iterable[str],
+        feedback_provider: Callable[[str], str],
+        *,
+        kept_only: bool = False,
+        sink: Callable[[RLHFResult], None] | None = None,
+        stats: RewardStats | None = None,
+    ) -> Iterator[RLHFResult]:
+        """Lazily yield :class:`RLHFResult` records as they are produced.
+
+        Unlike :meth:`train`, nothing is accumulated, so ``prompts`` may be
+        an unbounded iterator. With ``kept_only`` only results meeting the
+        threshold are yielded. Every result, kept or not, is passed to
+        ``sink`` (for example a :class:`JSONLSink`) and folded into
+        ``stats`` when given.
+        """
+
+        for result in self._iter_results(prompts, feedback_provider):
+            passed = result.reward >= self.threshold
+            if sink is not None:
+                sink(result)
+            if stats is not None:
+                stats.update(result.reward, passed)
+            if passed or not kept_only:
+                yield result
 
     def train(
         self,
@@ -28,21 +247,43 @@ class RLHFTrainer:
         feedback_provider: Callable[[str], str],
         *,
         return_history: bool = False,
-    ) -> List[str] | Tuple[List[str], List[RLHFResult]]:
+        columnar: bool = False,
+        dedup: bool = False,
+        dedup_threshold: float | None = None,
+    ) -> List[str] | Tuple[List[str], List[RLHFResult] | RLHFHistory]:
         """Return prompts that meet the reward threshold.
 
         When ``return_history`` is true, returns both the filtered prompts
-        and the per-example :class:`RLHFResult` records.
+        and the per-example :class:`RLHFResult` records, stored in an
+        :class:`RLHFHistory` when ``columnar`` is true.
+
+        With ``dedup``, feedback and rewards are computed once per distinct
+        prompt and reused for its repeats, which still appear in the kept
+        prompts and history. ``dedup_threshold`` also reuses them for
+        near-duplicates (see :func:`teslamind.dedup.deduplicate`).
         """
 
+        if dedup_threshold is not None and not dedup:
+            raise ValueError("dedup_threshold requires dedup=True")
+        results: Iterable[RLHFResult]
+        if dedup:
+            prompts = list(prompts)
+            plan = deduplicate(prompts, threshold=dedup_threshold)
+            get_instrumentation().count("rlhf.duplicates", plan.duplicates)
+            unique = plan.expand(list(self._iter_results(plan.unique, feedback_provider)))
+            results = (
+                RLHFResult(prompt=prompt, feedback=result.feedback, reward=result.reward)
+                for prompt, result in zip(prompts, unique)
+            )
+        else:
+            results = self._iter_results(prompts, feedback_provider)
+
         kept: List[str] = []
-        history: List[RLHFResult] = []
-        for prompt in prompts:
-            feedback = feedback_provider(prompt)
-            reward = self.reward_func(prompt, feedback)
-            history.append(RLHFResult(prompt=prompt, feedback=feedback, reward=reward))
-            if reward >= self.threshold:
-                kept.append(prompt)
+        history: List[RLHFResult] | RLHFHistory = RLHFHistory() if columnar else []
+        for result in results:
+            history.append(result)
+            if result.reward >= self.threshold:
+                kept.append(result.prompt)
 
         if return_history:
             return kept, history
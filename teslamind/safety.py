@@ -2,16 +2,124 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Set
+import re
+from functools import lru_cache
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+)
 
-DEFAULT_BLOCKED_TERMS: Set[str] = {"diagnosis", "treatment", "medical advice"}
+from .instrumentation import get_instrumentation
+
+DEFAULT_BLOCKED_TERMS: FrozenSet[str] = frozenset({"diagnosis", "treatment", "medical advice"})
+
+_Trie = Dict[str, "_Trie"]
+_END = ""
+
+
+def _trie_regex(node: _Trie) -> str:
+    """Return a regex matching every term stored below ``node``.
+
+    Alternatives at each node start with distinct characters, so at most
+    one can match and the regex engine never backtracks across siblings.
+    A node that ends a term makes the rest optional; the greedy ``?``
+    tries the longer continuation first, giving leftmost-longest matches.
+    Runs of single-child nodes are emitted as one literal, so nesting
+    depth grows with the number of branch points rather than term length.
+    """
+
+    alternatives: List[str] = []
+    leaves: List[str] = []
+    for char in sorted(key for key in node if key != _END):
+        literal, child = char, node[char]
+        while len(child) == 1 and _END not in child:
+            ((next_char, child),) = child.items()
+            literal += next_char
+        if list(child) == [_END]:
+            if len(literal) == 1:
+                leaves.append(literal)
+            else:
+                alternatives.append(re.escape(literal))
+        else:
+            alternatives.append(re.escape(literal) + _trie_regex(child))
+    if len(leaves) == 1:
+        alternatives.append(re.escape(leaves[0]))
+    elif leaves:
+        alternatives.append("[" + "".join(map(re.escape, leaves)) + "]")
+    if _END not in node and len(alternatives) == 1:
+        return alternatives[0]
+    group = "(?:" + "|".join(alternatives) + ")"
+    return group + "?" if _END in node else group
+
+
+class BlockedTermMatcher:
+    """Compiled matcher that finds every blocked term in a single pass.
+
+    The terms are folded into a trie and compiled to one case-insensitive
+    regex that follows the trie, so the cost per text position depends
+    on the length of the matched prefix rather than on the number of
+    terms, and overlapping terms resolve to the leftmost, longest match.
+    Build the matcher once and pass it wherever a ``blocked_terms``
+    iterable is accepted to skip recompilation.
+    """
+
+    def __init__(self, blocked_terms: Iterable[str]) -> None:
+        terms = sorted({term.lower() for term in blocked_terms if term}, key=len, reverse=True)
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self.max_length = len(terms[0]) if terms else 0
+        trie: _Trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_END] = {}
+        self._pattern = re.compile(_trie_regex(trie), re.IGNORECASE) if terms else None
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield ``(start, end, term)`` for each non-overlapping match."""
+
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            yield match.start(), match.end(), match.group().lower()
+
+    def find_terms(self, text: str) -> List[str]:
+        """Return the distinct blocked terms in ``text`` in order of appearance."""
+
+        return list(dict.fromkeys(term for _, _, term in self.finditer(text)))
+
+    def mask(self, text: str, mask: str = "[REDACTED]") -> str:
+        """Return ``text`` with every match replaced by ``mask``."""
+
+        if self._pattern is None:
+            return text
+        return self._pattern.sub(lambda _match: mask, text)
+
+
+@lru_cache(maxsize=32)
+def _compile_matcher(blocked_terms: FrozenSet[str]) -> BlockedTermMatcher:
+    return BlockedTermMatcher(blocked_terms)
+
+
+def _get_matcher(blocked_terms: Iterable[str]) -> BlockedTermMatcher:
+    if isinstance(blocked_terms, BlockedTermMatcher):
+        return blocked_terms
+    if isinstance(blocked_terms, frozenset):
+        # A frozenset caches its hash and the cache lookup compares by
+        # identity first, so the default terms (or any reused frozenset)
+        # hit the compiled matcher without touching the terms.
+        return _compile_matcher(blocked_terms)
+    return _compile_matcher(frozenset(blocked_terms))
 
 
 def _iter_matches(text: str, blocked_terms: Iterable[str]) -> Iterator[str]:
-    lowered = text.lower()
-    for term in blocked_terms:
-        if term in lowered:
-            yield term
+    yield from _get_matcher(blocked_terms).find_terms(text)
 
 
 def mask_sensitive_terms(
@@ -20,13 +128,9 @@ def mask_sensitive_terms(
     *,
     mask: str = "[REDACTED]",
 ) -> str:
-    """Return ``text`` with blocked terms masked."""
+    """Return ``text`` with blocked terms masked case-insensitively."""
 
-    result = text
-    for term in _iter_matches(text, blocked_terms):
-        result = result.replace(term, mask)
-        result = result.replace(term.title(), mask)
-    return result
+    return _get_matcher(blocked_terms).mask(text, mask)
 
 
 def filter_clinical_content(
@@ -41,9 +145,111 @@ def filter_clinical_content(
     instead of raising an exception.
     """
 
-    matches = list(_iter_matches(text, blocked_terms))
+    instrumentation = get_instrumentation()
+    matcher = _get_matcher(blocked_terms)
+    with instrumentation.span("safety.filter_seconds"):
+        matches = matcher.find_terms(text)
     if not matches:
         return text
+    instrumentation.count("safety.flagged")
     if mask:
-        return mask_sensitive_terms(text, blocked_terms)
+        return matcher.mask(text)
     raise ValueError(f"Clinical term(s) detected: {', '.join(matches)}")
+
+
+class StreamingSafetyFilter:
+    """Incrementally screen text that arrives in chunks.
+
+    Only the last ``max_length - 1`` characters are held back between
+    :meth:`feed` calls, which is the minimum needed to catch a blocked
+    term that straddles a chunk boundary, so memory stays bounded no
+    matter how long the stream runs. Call :meth:`flush` once the stream
+    ends to release the held-back tail.
+    """
+
+    def __init__(
+        self,
+        blocked_terms: Iterable[str] = DEFAULT_BLOCKED_TERMS,
+        *,
+        mask: bool = False,
+        mask_text: str = "[REDACTED]",
+    ) -> None:
+        self._matcher = _get_matcher(blocked_terms)
+        self._mask = mask
+        self._mask_text = mask_text
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Consume ``chunk`` and return the text that is safe to emit."""
+
+        buffer = self._pending + chunk
+        cut = len(buffer) - max(self._matcher.max_length - 1, 0)
+        pieces: List[str] = []
+        emitted = 0
+        for start, end, term in self._matcher.finditer(buffer):
+            if not self._mask:
+                self._pending = ""
+                raise ValueError(f"Clinical term(s) detected: {term}")
+            if start >= cut:
+                # A longer term starting here could still be completed by
+                # the next chunk, so the decision is deferred.
+                break
+            pieces.append(buffer[emitted:start])
+            pieces.append(self._mask_text)
+            emitted = end
+        boundary = max(cut, emitted)
+        pieces.append(buffer[emitted:boundary])
+        self._pending = buffer[boundary:]
+        return "".join(pieces)
+
+    def flush(self) -> str:
+        """Return the held-back tail, screened, and reset the filter."""
+
+        tail, self._pending = self._pending, ""
+        if self._mask:
+            return self._matcher.mask(tail, self._mask_text)
+        matches = self._matcher.find_terms(tail)
+        if matches:
+            raise ValueError(f"Clinical term(s) detected: {', '.join(matches)}")
+        return tail
+
+
+def filter_clinical_stream(
+    chunks: Iterable[str],
+    blocked_terms: Iterable[str] = DEFAULT_BLOCKED_TERMS,
+    *,
+    mask: bool = False,
+) -> Iterator[str]:
+    """Streaming counterpart of :func:`filter_clinical_content`.
+
+    Yields screened chunks as soon as they are known to be safe. When
+    ``mask`` is ``False`` a :class:`ValueError` is raised as soon as a
+    blocked term is seen; text before it may already have been yielded.
+    """
+
+    stream = StreamingSafetyFilter(blocked_terms, mask=mask)
+    for chunk in chunks:
+        safe = stream.feed(chunk)
+        if safe:
+            yield safe
+    tail = stream.flush()
+    if tail:
+        yield tail
+
+
+async def afilter_clinical_stream(
+    chunks: AsyncIterable[str],
+    blocked_terms: Iterable[str] = DEFAULT_BLOCKED_TERMS,
+    *,
+    mask: bool = False,
+) -> AsyncIterator[str]:
+    """Async variant of :func:`filter_clinical_stream`."""
+
+    stream = StreamingSafetyFilter(blocked_terms, mask=mask)
+    async for chunk in chunks:
+        safe = stream.feed(chunk)
+        if safe:
+            yield safe
+    tail = stream.flush()
+    if tail:
+        yield tail
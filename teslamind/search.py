@@ -0,0 +1,216 @@
+"""Full-text search over prompt catalogs.
+
+:class:`SearchIndex` keeps an inverted index of term frequencies per
+prompt in a SQLite database and ranks matches with BM25. Postings are
+stored one row per ``(term, prompt)`` under a primary key on the term,
+so a query reads only the postings of its own terms instead of loading
+the whole index. :meth:`SearchIndex.update` only re-tokenizes prompts
+whose content hash changed, so queries never scan prompt files.
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .catalog import PromptCatalog, default_index_path
+
+INDEX_VERSION = 2
+REFRESH_MODES = ("files", "directories", "never")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+    "CREATE TABLE IF NOT EXISTS docs ("
+    "path TEXT PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL, "
+    "sha256 TEXT NOT NULL, length INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS postings ("
+    "term TEXT NOT NULL, path TEXT NOT NULL, frequency INTEGER NOT NULL, "
+    "PRIMARY KEY (term, path)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS postings_path ON postings(path)",
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lowercase alphanumeric terms."""
+
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _directory_signature(catalog: PromptCatalog) -> str:
+    """Return the modification times of the catalog directories.
+
+    A directory's mtime changes when files are added, removed or renamed
+    into it (as most editors do when saving), but not when a file is
+    rewritten in place.
+    """
+
+    stamps = []
+    for directory in (catalog.prompt_dir, catalog.prompt_dir / "developer"):
+        try:
+            stamps.append(str(os.stat(directory).st_mtime_ns))
+        except FileNotFoundError:
+            stamps.append("-")
+    return ":".join(stamps)
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result."""
+
+    name: str
+    category: str
+    path: str
+    score: float
+
+
+class SearchIndex:
+    """Persisted BM25 inverted index over prompt files."""
+
+    def __init__(self, index_path: Path, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+        self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        for _ in range(2):
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.index_path)
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version in (0, INDEX_VERSION):
+                    self._create(conn)
+                    return conn
+                conn.close()
+            except sqlite3.DatabaseError:
+                pass
+            except OSError:
+                break
+            # An older or corrupt index is only a cache: rebuild it.
+            try:
+                self.index_path.unlink()
+            except OSError:
+                break
+        # Unwritable cache directory: keep the index in memory for this process.
+        conn = sqlite3.connect(":memory:")
+        self._create(conn)
+        return conn
+
+    @staticmethod
+    def _create(conn: sqlite3.Connection) -> None:
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @classmethod
+    def for_catalog(
+        cls, catalog: PromptCatalog, *, refresh: str = "files", **options: Any
+    ) -> "SearchIndex":
+        """Return the index stored alongside ``catalog``.
+
+        ``refresh="files"`` (the default) brings the index up to date via
+        :meth:`PromptCatalog.refresh`, which stats every prompt and re-hashes
+        only changed files. ``"directories"`` skips that scan unless the
+        modification time of a catalog directory changed, which is cheaper
+        but misses files rewritten in place. ``"never"`` uses the index as is.
+        """
+
+        if refresh not in REFRESH_MODES:
+            raise ValueError(f"refresh must be one of {', '.join(REFRESH_MODES)}")
+        index = cls(default_index_path(catalog.prompt_dir, "search", ".sqlite3"), **options)
+        if refresh == "files" or (
+            refresh == "directories" and index._meta("signature") != _directory_signature(catalog)
+        ):
+            index.update(catalog)
+        return index
+
+    def _meta(self, key: str, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def _remove(self, path: str) -> None:
+        self._conn.execute("DELETE FROM postings WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM docs WHERE path = ?", (path,))
+
+    def _add(self, path: str, name: str, category: str, sha256: str, text: str) -> None:
+        counts = Counter(tokenize(text))
+        self._conn.execute(
+            "INSERT INTO docs (path, name, category, sha256, length) VALUES (?, ?, ?, ?, ?)",
+            (path, name, category, sha256, sum(counts.values())),
+        )
+        self._conn.executemany(
+            "INSERT INTO postings (term, path, frequency) VALUES (?, ?, ?)",
+            [(term, path, frequency) for term, frequency in counts.items()],
+        )
+
+    def update(self, catalog: PromptCatalog) -> int:
+        """Synchronise the index with ``catalog`` and return the number of changes."""
+
+        signature = _directory_signature(catalog)
+        entries = {entry.path: entry for entry in catalog.refresh().entries()}
+        indexed: Dict[str, str] = dict(self._conn.execute("SELECT path, sha256 FROM docs"))
+        changes = 0
+        with self._conn:
+            for path in [path for path in indexed if path not in entries]:
+                self._remove(path)
+                changes += 1
+            for path, entry in entries.items():
+                sha256 = indexed.get(path)
+                if sha256 == entry.sha256:
+                    continue
+                if sha256 is not None:
+                    self._remove(path)
+                self._add(path, entry.name, entry.category, entry.sha256, entry.text)
+                changes += 1
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+            ).fetchone()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("signature", signature), ("count", count), ("total_length", total)],
+            )
+        return changes
+
+    def search(self, query: str, *, limit: int = 10, category: str | None = None) -> List[SearchHit]:
+        """Return up to ``limit`` prompts ranked by BM25 relevance to ``query``."""
+
+        count = self._meta("count", 0)
+        if not count:
+            return []
+        average = self._meta("total_length", 0) / count or 1.0
+        scores: Dict[str, float] = {}
+        docs: Dict[str, Tuple[str, str]] = {}
+        for term in set(tokenize(query)):
+            postings = self._conn.execute(
+                "SELECT p.path, p.frequency, d.length, d.name, d.category "
+                "FROM postings AS p JOIN docs AS d ON d.path = p.path WHERE p.term = ?",
+                (term,),
+            ).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for path, frequency, length, name, doc_category in postings:
+                docs[path] = (name, doc_category)
+                norm = self.k1 * (1 - self.b + self.b * length / average)
+                scores[path] = scores.get(path, 0.0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + norm
+                )
+        hits = [
+            SearchHit(name=docs[path][0], category=docs[path][1], path=path, score=score)
+            for path, score in scores.items()
+            if category is None or docs[path][1] == category
+        ]
+        hits.sort(key=lambda hit: (-hit.score, hit.name))
+        return hits[:limit]
+
+    def __len__(self) -> int:
+        return self._meta("count", 0)
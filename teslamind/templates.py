@@ -1,2 +1,130 @@
-"""Prompt templates."""
+"""Prompt templates.
+
+Templates use ``str.format`` placeholders such as ``{task}``. They are
+parsed once by :func:`compile_template` into a :class:`CompiledTemplate`
+and cached, so rendering a template repeatedly never re-parses it.
+:func:`compose` builds templates from a mode prefix, a persona and a task
+template.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from string import Formatter
+from typing import Iterable, List, Tuple
+
+from .modes import MODE_PREFIXES
+from .persona import Persona
+
 DEFAULT_TEMPLATE = "You are smarter than Nikola Tesla in 2024. {task}"
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class CompiledTemplate:
+    """A template parsed into literal text and named fields."""
+
+    def __init__(self, source: str) -> None:
+        segments: List[Tuple[str, str | None]] = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (not field.isidentifier() or spec or conversion):
+                raise ValueError(f"unsupported placeholder {{{field}}} in template")
+            segments.append((literal, field))
+        self.source = source
+        self._segments = tuple(segments)
+        self.fields = tuple(dict.fromkeys(f for _, f in segments if f is not None))
+
+    def render(self, **values: str) -> str:
+        """Return the template with every field substituted from ``values``."""
+
+        missing = [field for field in self.fields if field not in values]
+        if missing:
+            raise KeyError(f"missing template field(s): {', '.join(missing)}")
+        parts = []
+        for literal, field in self._segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+    def partial(self, **values: str) -> "CompiledTemplate":
+        """Return a compiled template with the given fields bound."""
+
+        parts = []
+        for literal, field in self._segments:
+            parts.append(_escape(literal))
+            if field is not None:
+                parts.append(_escape(str(values[field])) if field in values else f"{{{field}}}")
+        return compile_template("".join(parts))
+
+    def render_many(self, tasks: Iterable[str], *, field: str = "task", **values: str) -> List[str]:
+        """Render the template once per item of ``tasks``.
+
+        ``values`` are bound up front and ``field`` receives each task. The
+        remaining template is reduced to a single ``%``-format string so
+        each item costs one formatting call and one allocation.
+        """
+
+        bound = self.partial(**values) if values else self
+        unknown = [name for name in bound.fields if name != field]
+        if unknown:
+            raise KeyError(f"missing template field(s): {', '.join(unknown)}")
+        pattern = []
+        occurrences = 0
+        for literal, name in bound._segments:
+            pattern.append(literal.replace("%", "%%"))
+            if name is not None:
+                pattern.append("%s")
+                occurrences += 1
+        fmt = "".join(pattern)
+        if occurrences == 1:
+            return [fmt % (task,) for task in tasks]
+        return [fmt % ((task,) * occurrences) for task in tasks]
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source!r})"
+
+
+@lru_cache(maxsize=512)
+def compile_template(source: str) -> CompiledTemplate:
+    """Parse ``source`` once and cache the compiled template."""
+
+    return CompiledTemplate(source)
+
+
+def compose(
+    template: str = DEFAULT_TEMPLATE,
+    *,
+    mode: str | None = None,
+    persona: Persona | None = None,
+) -> CompiledTemplate:
+    """Compile ``template`` prefixed with a mode and persona.
+
+    ``mode`` is a key of :data:`teslamind.modes.MODE_PREFIXES` such as
+    ``"energy"``. The persona text is escaped so braces in its description
+    are not treated as placeholders.
+    """
+
+    parts = []
+    if mode is not None:
+        try:
+            parts.append(_escape(MODE_PREFIXES[mode]))
+        except KeyError:
+            raise ValueError(f"unknown mode {mode!r}") from None
+    if persona is not None:
+        parts.append(_escape(persona.as_prompt()))
+    parts.append(template)
+    return compile_template(" ".join(parts))
+
+
+def render_many(
+    tasks: Iterable[str],
+    template: str = DEFAULT_TEMPLATE,
+    *,
+    mode: str | None = None,
+    persona: Persona | None = None,
+) -> List[str]:
+    """Render ``tasks`` through the composed template."""
+
+    return compose(template, mode=mode, persona=persona).render_many(tasks)
@@ -1,6 +1,6 @@
 """Utility functions."""
-from .files import read_file
+from .files import file_digest, file_fingerprint, read_file
 from .strings import slugify
 from .formatting import bold
 
-__all__ = ["read_file", "slugify", "bold"]
+__all__ = ["read_file", "file_digest", "file_fingerprint", "slugify", "bold"]
@@ -1,5 +1,40 @@
 """File helpers."""
+from __future__ import annotations
+
+import hashlib
 from pathlib import Path
+from typing import Any, Dict
 
 def read_file(path: Path) -> str:
     return path.read_text()
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of ``path``'s contents."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path, previous: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Return ``{"size", "mtime_ns", "sha256"}`` for ``path``.
+
+    When ``previous`` has the same size and modification time the file
+    is assumed unchanged and its digest is reused without reading the
+    file; otherwise the contents are hashed.
+    """
+
+    stat = path.stat()
+    if (
+        previous is not None
+        and previous.get("size") == stat.st_size
+        and previous.get("mtime_ns") == stat.st_mtime_ns
+        and "sha256" in previous
+    ):
+        sha256 = previous["sha256"]
+    else:
+        sha256 = file_digest(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
@@ -1,4 +1,5 @@
 from teslamind.advanced import (
+    BlockedTermMatcher,
     FederatedShardResult,
     RLHFResult,
     RLHFTrainer,
@@ -15,6 +16,7 @@ def test_advanced_reexports():
     assert RLHFTrainer.__module__ == "teslamind.rlhf"
     assert filter_clinical_content.__module__ == "teslamind.safety"
     assert mask_sensitive_terms.__module__ == "teslamind.safety"
+    assert BlockedTermMatcher.__module__ == "teslamind.safety"
     assert run_federated_evaluation.__module__ == "teslamind.federated"
     assert RefinementHistory.__module__ == "teslamind.refinement"
     assert FederatedShardResult.__module__ == "teslamind.federated"
@@ -1,6 +1,10 @@
+import random
+import re
+
 import pytest
 
 from teslamind import (
+    BlockedTermMatcher,
     FederatedShardResult,
     RLHFTrainer,
     RLHFResult,
@@ -63,3 +67,25 @@ def test_filter_clinical_content():
     masked = filter_clinical_content("Seek medical advice", mask=True)
     assert "[REDACTED]" in masked
     assert mask_sensitive_terms("treatment plan") == "[REDACTED] plan"
+
+
+def test_blocked_term_matcher_single_pass():
+    matcher = BlockedTermMatcher(["medical", "medical advice", "Diagnosis"])
+    text = "Medical Advice and a DIAGNOSIS"
+    assert list(matcher.finditer(text)) == [(0, 14, "medical advice"), (21, 30, "diagnosis")]
+    assert matcher.mask(text, "***") == "*** and a ***"
+    assert mask_sensitive_terms(text, matcher) == "[REDACTED] and a [REDACTED]"
+    with pytest.raises(ValueError, match="medical advice, diagnosis"):
+        filter_clinical_content(text, matcher)
+
+
+def test_blocked_term_matcher_matches_alternation_semantics():
+    rng = random.Random(7)
+    terms = {"".join(rng.choice("abc .") for _ in range(rng.randint(1, 5))) for _ in range(200)}
+    terms = {term for term in terms if term.strip()}
+    matcher = BlockedTermMatcher(terms)
+    reference = re.compile("|".join(map(re.escape, matcher.terms)), re.IGNORECASE)
+    for _ in range(200):
+        text = "".join(rng.choice("aAbBc. x") for _ in range(40))
+        expected = [(m.start(), m.end(), m.group().lower()) for m in reference.finditer(text)]
+        assert list(matcher.finditer(text)) == expected
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from teslamind import ai_client
+from teslamind.ai_client import (
+    AsyncLLMClient,
+    HTTPTransport,
+    LLMClient,
+    TokenBucket,
+    call_llm,
+    response_key,
+)
+from teslamind.cache import SQLiteCache
+from teslamind.exceptions import TransportError
+from teslamind.federated import run_federated_evaluation
+
+
+class SystemMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class HumanMessage(SystemMessage):
+    pass
+
+
+def test_response_key_depends_on_roles_and_params():
+    base = response_key([SystemMessage("hi")], model="a")
+    assert base == response_key([SystemMessage("hi")], model="a")
+    assert base != response_key([HumanMessage("hi")], model="a")
+    assert base != response_key([SystemMessage("hi")], model="b")
+
+
+def test_call_llm_uses_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_complete(messages, **params):
+        calls.append(messages)
+        return "fresh"
+
+    monkeypatch.setattr(ai_client, "_complete", fake_complete)
+    cache = SQLiteCache(tmp_path / "llm.sqlite3")
+    assert call_llm(["ping"], cache=cache, model="m") == "fresh"
+    assert call_llm(["ping"], cache=cache, model="m") == "fresh"
+    assert len(calls) == 1
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    batches: list = []
+    peers: set = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).batches.append(body["requests"])
+        type(self).peers.add(self.client_address)
+        replies = [request["messages"][-1][1].upper() for request in body["requests"]]
+        data = json.dumps({"responses": replies}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubHandler.batches = []
+    _StubHandler.peers = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/batch"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_client_batches_and_reuses_connections(stub_server):
+    transport = HTTPTransport(stub_server, pool_size=1)
+
+    async def run():
+        client = AsyncLLMClient(transport, max_batch_size=4, batch_window=0.01)
+        first = await client.call_many([["a"], ["b"], ["c"], ["d"], ["e"]])
+        second = await client.call(["f"])
+        return first, second
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        transport.close()
+    assert first == ["A", "B", "C", "D", "E"]
+    assert second == "F"
+    assert [len(batch) for batch in _StubHandler.batches] == [4, 1, 1]
+    assert transport.connections_opened == 1
+    assert len(_StubHandler.peers) == 1
+
+
+def test_async_client_coalesces_identical_requests():
+    calls = []
+
+    async def transport(requests):
+        calls.append(requests)
+        return ["ok"] * len(requests)
+
+    async def run():
+        client = AsyncLLMClient(transport)
+        replies = await asyncio.gather(*(client.call(["same"]) for _ in range(5)))
+        return client, replies
+
+    client, replies = asyncio.run(run())
+    assert replies == ["ok"] * 5
+    assert sum(len(batch) for batch in calls) == 1
+    assert client.coalesced == 4
+
+
+def test_async_client_retries_with_backoff():
+    attempts = []
+
+    async def flaky(requests):
+        attempts.append(len(requests))
+        if len(attempts) < 3:
+            raise TransportError("boom")
+        return ["ok"] * len(requests)
+
+    async def run():
+        return await AsyncLLMClient(flaky, backoff=0.001).call(["x"])
+
+    assert asyncio.run(run()) == "ok"
+    assert len(attempts) == 3
+
+    async def always_fail(requests):
+        raise TransportError("down")
+
+    async def run_failing():
+        return await AsyncLLMClient(always_fail, max_retries=1, backoff=0.001).call(["x"])
+
+    with pytest.raises(TransportError):
+        asyncio.run(run_failing())
+
+
+def test_async_client_fails_every_request_on_short_reply():
+    async def short(requests):
+        return ["ok"] * (len(requests) - 1)
+
+    async def run():
+        client = AsyncLLMClient(short, max_retries=0, batch_window=0.01)
+        return await asyncio.gather(
+            *(client.call([str(i)]) for i in range(3)), return_exceptions=True
+        )
+
+    outcomes = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, TransportError) for outcome in outcomes)
+
+
+def test_async_client_can_be_reused_across_event_loops():
+    async def echo(requests):
+        await asyncio.sleep(0.001)
+        return [messages[0] for messages, _ in requests]
+
+    client = AsyncLLMClient(echo, max_batch_size=1, max_concurrency=1, rate=1000)
+
+    async def run(prompts):
+        return await client.call_many([[prompt] for prompt in prompts])
+
+    assert asyncio.run(asyncio.wait_for(run(["a", "b"]), timeout=5)) == ["a", "b"]
+    assert asyncio.run(asyncio.wait_for(run(["c"]), timeout=5)) == ["c"]
+
+    for _ in range(2):
+        outputs = run_federated_evaluation(
+            ["x", "y", "z"],
+            lambda prompt: asyncio.wait_for(client.call([prompt]), timeout=5),
+            shards=2,
+            executor="asyncio",
+        )
+        assert outputs == ["x", "y", "z"]
+
+
+def test_async_client_releases_callers_when_send_is_cancelled():
+    started = asyncio.Event()
+
+    async def hang(requests):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def run():
+        client = AsyncLLMClient(hang, batch_window=0)
+        calls = [asyncio.ensure_future(client.call([str(i)])) for i in range(3)]
+        await started.wait()
+        for task in list(client._tasks):
+            task.cancel()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    outcomes = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert all(isinstance(outcome, asyncio.CancelledError) for outcome in outcomes)
+
+
+def test_token_bucket_limits_rate():
+    async def run():
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_sync_facade_shares_batches_across_threads():
+    seen = []
+
+    async def transport(requests):
+        seen.append(len(requests))
+        return [messages[0] for messages, _ in requests]
+
+    with LLMClient(transport, batch_window=0.05) as client:
+        results = {}
+        threads = [
+            threading.Thread(target=lambda n=n: results.__setitem__(n, client.call([f"p{n}"])))
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert results == {n: f"p{n}" for n in range(4)}
+    assert sum(seen) == 4 and len(seen) < 4
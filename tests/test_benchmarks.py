@@ -0,0 +1,74 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RUNNER = REPO_ROOT / "benchmarks" / "run_benchmarks.py"
+
+
+def _run(tmp_path, *args):
+    return subprocess.run(
+        [
+            sys.executable,
+            str(RUNNER),
+            "safety.filter",
+            "--scale=0.01",
+            "--repeat=1",
+            "--rounds=1",
+            f"--output={tmp_path / 'results.json'}",
+            f"--baseline={tmp_path / 'base.json'}",
+            *args,
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_runner_records_results_and_detects_regressions(tmp_path):
+    assert _run(tmp_path, "--update-baseline").returncode == 0
+    results = json.loads((tmp_path / "results.json").read_text())
+    bench = results["benchmarks"]["safety.filter"]
+    assert bench["units"] == 10 and bench["throughput"] > 0 and bench["peak_bytes"] >= 0
+
+    assert _run(tmp_path, "--threshold", "0.99").returncode == 0
+    baseline = json.loads((tmp_path / "base.json").read_text())
+    baseline["benchmarks"]["safety.filter"]["throughput"] *= 1000
+    (tmp_path / "base.json").write_text(json.dumps(baseline))
+    completed = _run(tmp_path)
+    assert completed.returncode == 1
+    assert "REGRESSION safety.filter" in completed.stderr
+
+
+def test_baseline_from_another_host_is_rescaled(tmp_path):
+    assert _run(tmp_path, "--update-baseline").returncode == 0
+    baseline = json.loads((tmp_path / "base.json").read_text())
+    baseline["platform"] = "elsewhere"
+    baseline["python"] = "0.0"
+    baseline["reference_throughput"] *= 1000
+    baseline["benchmarks"]["safety.filter"]["throughput"] *= 1000
+    baseline["benchmarks"]["safety.filter"]["peak_bytes"] = 0
+    (tmp_path / "base.json").write_text(json.dumps(baseline))
+    completed = _run(tmp_path, "--threshold", "0.9")
+    assert completed.returncode == 0
+    assert "WARNING baseline was recorded with Python 0.0 on elsewhere" in completed.stderr
+    assert "skipping peak memory" in completed.stderr
+
+
+def test_same_host_allows_for_noise_and_a_slower_machine(tmp_path):
+    assert _run(tmp_path, "--update-baseline").returncode == 0
+    recorded = json.loads((tmp_path / "base.json").read_text())
+
+    def compare_with(throughput=1.0, noise=0.0, reference=1.0):
+        baseline = json.loads(json.dumps(recorded))
+        baseline["reference_throughput"] *= reference
+        bench = baseline["benchmarks"]["safety.filter"]
+        bench["throughput"] *= throughput
+        bench["noise"] = noise
+        (tmp_path / "base.json").write_text(json.dumps(baseline))
+        return _run(tmp_path, "--threshold", "0.5")
+
+    assert compare_with(throughput=10).returncode == 1
+    assert compare_with(throughput=10, noise=0.95).returncode == 0
+    assert compare_with(throughput=10, reference=10).returncode == 0
+    assert compare_with(throughput=10, reference=0.1).returncode == 1
@@ -0,0 +1,121 @@
+import multiprocessing
+import sqlite3
+import threading
+
+from teslamind import cache
+from teslamind.cache import LRUCache, SQLiteCache
+from teslamind.config import Config
+
+
+def test_lru_eviction_and_stats():
+    lru = LRUCache(max_entries=2)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    assert lru.get("a") == "1"
+    lru.set("c", "3")
+    assert lru.get("b") is None
+    assert lru.get("a") == "1"
+    stats = lru.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 1, 1)
+
+
+def test_max_bytes_and_ttl():
+    now = [0.0]
+    lru = LRUCache(max_bytes=10, ttl=5, sizeof=lambda k, v: len(v), clock=lambda: now[0])
+    lru.set("a", "12345")
+    lru.set("b", "123456")
+    assert len(lru) == 1 and lru.nbytes == 6
+    lru.set("c", "x", ttl=1)
+    now[0] = 2.0
+    assert lru.get("c") is None
+    assert lru.get("b") == "123456"
+    now[0] = 6.0
+    assert lru.get("b") is None
+    assert lru.stats.expirations == 2
+
+
+def test_concurrent_writers_respect_bound():
+    lru = LRUCache(max_entries=50)
+
+    def writer(offset: int) -> None:
+        for i in range(500):
+            lru.set(f"{offset}-{i}", str(i))
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(lru) == 50
+    assert lru.stats.evictions == 8 * 500 - 50
+
+
+def test_module_functions_follow_config():
+    try:
+        cache.configure(Config(cache_max_entries=1))
+        cache.set("k", "v")
+        assert cache.get("k") == "v"
+        cache.configure(Config(cache_enabled=False))
+        cache.set("k", "v")
+        assert cache.get("k") is None
+    finally:
+        cache.configure(Config())
+
+
+def _write_many(path: str, offset: int) -> None:
+    disk = SQLiteCache(path, max_entries=30)
+    for i in range(40):
+        disk.set(f"{offset}-{i}", "x" * i)
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    disk = SQLiteCache(path, max_entries=2)
+    disk.set("a", "1")
+    disk.set("b", "2")
+    assert disk.get("a") == "1"
+    disk.set("c", "3")
+    reopened = SQLiteCache(path)
+    assert reopened.get("b") is None
+    assert (reopened.get("a"), reopened.get("c")) == ("1", "3")
+    assert disk.get_or_compute("d", lambda: "4") == "4"
+    assert len(disk) == 2
+
+
+def test_sqlite_cache_hits_do_not_take_the_write_lock(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    disk = SQLiteCache(path, max_entries=2, timeout=0.1, touch_batch=100)
+    disk.set("a", "1")
+    disk.set("b", "2")
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        assert disk.get("a") == "1"
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    disk.set("c", "3")
+    assert disk.get("b") is None and disk.get("a") == "1"
+
+
+def test_sqlite_cache_max_bytes(tmp_path):
+    disk = SQLiteCache(tmp_path / "c.sqlite3", max_bytes=10)
+    disk.set("a", "1234")
+    disk.set("b", "1234")
+    assert len(disk) == 2
+    disk.set("c", "123456789")
+    assert len(disk) == 1 and disk.get("c") == "123456789"
+    assert disk.stats.evictions == 2
+
+
+def test_sqlite_cache_concurrent_processes(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    SQLiteCache(path)
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_write_many, args=(path, n)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    assert len(SQLiteCache(path)) == 30
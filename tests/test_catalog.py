@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from teslamind import catalog as catalog_module
+from teslamind.catalog import PromptCatalog
+
+
+def _make_catalog(tmp_path: Path):
+    prompts = tmp_path / "prompts"
+    (prompts / "developer").mkdir(parents=True)
+    (prompts / "alpha.txt").write_text("alpha text")
+    (prompts / "beta.txt").write_text("beta text")
+    (prompts / "developer" / "audit.txt").write_text("audit text")
+    metadata = tmp_path / "metadata"
+    metadata.mkdir()
+    (metadata / "alpha.json").write_text(
+        json.dumps(
+            {
+                "title": "Alpha",
+                "version": "1",
+                "domain": "energy",
+                "license": "MIT",
+                "length_tokens": 12,
+                "prompt_path": "../prompts/alpha.txt",
+            }
+        )
+    )
+    return PromptCatalog(prompts, metadata, tmp_path / "index.json")
+
+
+def test_catalog_indexes_prompts_and_metadata(tmp_path: Path):
+    catalog = _make_catalog(tmp_path).refresh()
+    assert [e.name for e in catalog.entries("user")] == ["alpha", "beta"]
+    assert [e.name for e in catalog.entries("developer")] == ["audit"]
+    assert [e.name for e in catalog.filter(domain="energy", max_tokens=20)] == ["alpha"]
+    assert catalog.filter(license="MIT", min_tokens=13) == []
+    assert catalog.get("beta").load().text == "beta text"
+    assert (tmp_path / "index.json").exists()
+
+
+def test_catalog_refresh_only_rehashes_changed_files(tmp_path: Path, monkeypatch):
+    _make_catalog(tmp_path).refresh()
+    hashed = []
+    real_fingerprint = catalog_module.file_fingerprint
+
+    def counting_fingerprint(path, previous=None):
+        hashed.append(path.name)
+        return real_fingerprint(path, previous)
+
+    monkeypatch.setattr(catalog_module, "file_fingerprint", counting_fingerprint)
+    (tmp_path / "prompts" / "beta.txt").write_text("beta text, revised")
+    (tmp_path / "prompts" / "gamma.txt").write_text("gamma")
+    catalog = PromptCatalog(tmp_path / "prompts", tmp_path / "metadata", tmp_path / "index.json")
+    catalog.refresh()
+    assert sorted(hashed) == ["beta.txt", "gamma.txt"]
+    assert catalog.get("beta").size == len("beta text, revised")
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -35,3 +36,28 @@ def test_show_prompt_missing(monkeypatch):
     monkeypatch.setattr(cli, "DEVELOPER_DIR", Path("/nonexistent"))
     with pytest.raises(SystemExit):
         cli.show_prompt("unknown")
+
+
+def test_find_prompts_by_metadata(monkeypatch, tmp_path: Path, capsys):
+    monkeypatch.setenv("TESLAMIND_CACHE_DIR", str(tmp_path))
+    cli.main(["find", "--domain", "general"])
+    captured = capsys.readouterr()
+    assert captured.out.split("\t")[0] == "prompt1"
+
+
+def test_search_prompts(monkeypatch, tmp_path: Path, capsys):
+    monkeypatch.setenv("TESLAMIND_CACHE_DIR", str(tmp_path))
+    cli.main(["search", "reward", "--developer"])
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[0].startswith("reward_audit\tdeveloper")
+
+
+def test_recompute_tokens_writes_metadata(monkeypatch, tmp_path: Path, capsys):
+    (tmp_path / "p.txt").write_text("Harness the energy of lightning.")
+    meta = tmp_path / "meta.json"
+    meta.write_text(json.dumps({"title": "t", "prompt_path": "p.txt", "length_tokens": 1}))
+    monkeypatch.setattr(cli, "METADATA_DIR", tmp_path)
+    cli.main(["tokens", "--write"])
+    count = json.loads(meta.read_text())["length_tokens"]
+    assert count > 1
+    assert capsys.readouterr().out.strip() == f"meta\t1\t{count}"
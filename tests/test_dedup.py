@@ -0,0 +1,57 @@
+import pytest
+
+from teslamind import run_federated_evaluation
+from teslamind.dedup import MinHasher, deduplicate, similarity
+from teslamind.rlhf import RLHFTrainer
+
+
+def test_exact_dedup_plan_expands_outputs():
+    plan = deduplicate(["a", "b", "a", "c", "b"])
+    assert plan.unique == ["a", "b", "c"]
+    assert plan.assignments == [0, 1, 0, 2, 1]
+    assert plan.duplicates == 2
+    assert plan.expand(["A", "B", "C"]) == ["A", "B", "A", "C", "B"]
+    assert plan.members() == [[0, 2], [1, 4], [3]]
+
+
+def test_minhash_near_duplicates():
+    base = "Explain how a Tesla coil produces high-voltage, high-frequency current."
+    near = "Explain how a Tesla coil produces high voltage, high frequency current!"
+    other = "Write a short poem about pigeons in Manhattan during winter."
+    hasher = MinHasher(128)
+    assert similarity(hasher.signature(base), hasher.signature(near)) > 0.6
+    assert similarity(hasher.signature(base), hasher.signature(other)) < 0.2
+    plan = deduplicate([base, other, near], threshold=0.6)
+    assert plan.unique == [base, other]
+    assert plan.assignments == [0, 1, 0]
+    with pytest.raises(ValueError):
+        deduplicate([base], threshold=1.5)
+
+
+def test_federated_dedup_evaluates_each_prompt_once():
+    calls = []
+    prompts = ["a", "bb", "a", "ccc", "bb", "a"]
+    results, shards = run_federated_evaluation(
+        prompts,
+        lambda p: calls.append(p) or len(p),
+        shards=2,
+        dedup=True,
+        return_shard_results=True,
+    )
+    assert results == [1, 2, 1, 3, 2, 1]
+    assert sorted(calls) == ["a", "bb", "ccc"]
+    assert sorted(p for shard in shards for p in shard.prompts) == sorted(prompts)
+
+
+def test_rlhf_dedup_keeps_every_input():
+    calls = []
+
+    def feedback(prompt):
+        calls.append(prompt)
+        return prompt.upper()
+
+    trainer = RLHFTrainer(lambda p, f: float(len(p)), threshold=2)
+    kept, history = trainer.train(["x", "yy", "x", "yy"], feedback, dedup=True, return_history=True)
+    assert kept == ["yy", "yy"]
+    assert [r.prompt for r in history] == ["x", "yy", "x", "yy"]
+    assert calls == ["x", "yy"]
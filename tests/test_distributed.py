@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from teslamind.distributed import Coordinator, run_distributed_evaluation, spawn_worker
+from teslamind.exceptions import WorkerError
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_local_workers_return_federated_shape():
+    prompts = [str(i) * (i % 5 + 1) for i in range(40)]
+    results, shards = run_distributed_evaluation(
+        prompts, "builtins:len", workers=3, chunk_size=4, timeout=60, return_shard_results=True
+    )
+    assert results == [len(p) for p in prompts]
+    assert sorted(p for shard in shards for p in shard.prompts) == sorted(prompts)
+
+
+def test_lost_worker_chunks_are_reassigned(tmp_path):
+    (tmp_path / "flaky.py").write_text(
+        "import os\n"
+        "def evaluate(prompt):\n"
+        "    if prompt == 'boom' and not os.environ.get('SURVIVOR'):\n"
+        "        os._exit(1)\n"
+        "    return len(prompt)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(tmp_path), str(REPO_ROOT)])}
+    prompts = ["a", "bb", "ccc", "boom", "eeeee", "ffffff"]
+    with Coordinator(chunk_size=3) as coordinator:
+        crasher = spawn_worker(coordinator.address, "flaky:evaluate", env=env)
+        outcome = {}
+        runner = threading.Thread(
+            target=lambda: outcome.update(results=coordinator.run(prompts, timeout=60))
+        )
+        runner.start()
+        assert crasher.wait(timeout=30) == 1
+        survivor_env = {**env, "SURVIVOR": "1"}
+        survivor = spawn_worker(coordinator.address, "flaky:evaluate", env=survivor_env)
+        runner.join(timeout=60)
+        survivor.wait(timeout=30)
+    assert outcome["results"] == [1, 2, 3, 4, 5, 6]
+    assert coordinator.workers_lost == 1
+    assert coordinator.reassigned == 3
+
+
+def test_worker_exception_raises_worker_error():
+    with pytest.raises(WorkerError, match="ValueError"):
+        run_distributed_evaluation(["1", "x"], "builtins:int", workers=1, timeout=60)
+
+
+def test_worker_cli_rejects_bad_address():
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "teslamind.distributed",
+            "worker",
+            "--connect=nowhere",
+            "--evaluate=builtins:len",
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 2
+    assert "HOST:PORT" in completed.stderr
+
+
+def test_dead_workers_raise_instead_of_hanging():
+    with pytest.raises(WorkerError, match="exited"):
+        run_distributed_evaluation(["a", "b"], "no_such_module:evaluate", workers=2)
+
+
+def test_coordinator_rejects_workers_without_token():
+    with Coordinator(token="secret") as coordinator:
+        intruder = spawn_worker(coordinator.address, "builtins:len", stderr=subprocess.PIPE)
+        with pytest.raises(WorkerError, match="exited"):
+            coordinator.run(["a", "bb"], timeout=60, processes=[intruder])
+        _, stderr = intruder.communicate(timeout=30)
+    assert intruder.returncode == 1
+    assert b"invalid worker token" in stderr
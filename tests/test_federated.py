@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from teslamind import FederatedShardResult, run_federated_evaluation
+from teslamind.federated import FederatedHistory
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "process"])
+def test_executors_preserve_order(executor):
+    prompts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    results, shard_results = run_federated_evaluation(
+        prompts, len, shards=3, executor=executor, return_shard_results=True
+    )
+    assert results == [1, 2, 3, 4, 5]
+    assert [r.shard_index for r in shard_results] == [0, 1, 2]
+    assert shard_results[1].prompts == ("bb", "eeeee")
+    assert shard_results[1].outputs == (2, 5)
+
+
+def test_thread_executor_runs_shards_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def evaluate(prompt: str) -> str:
+        barrier.wait()
+        return prompt.upper()
+
+    results = run_federated_evaluation(["x", "y"], evaluate, shards=2, executor="thread")
+    assert results == ["X", "Y"]
+
+
+def test_asyncio_executor_bounds_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def evaluate(prompt: str) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return len(prompt)
+
+    results = run_federated_evaluation(
+        ["a", "bb", "ccc", "dddd"], evaluate, shards=4, executor="asyncio", max_workers=2
+    )
+    assert results == [1, 2, 3, 4]
+    assert peak == 2
+
+
+def test_unknown_executor_rejected():
+    with pytest.raises(ValueError):
+        run_federated_evaluation(["a"], len, executor="gpu")
+
+
+def test_columnar_shard_history():
+    results, history = run_federated_evaluation(
+        ["a", "bb", "ccc"], len, shards=2, return_shard_results=True, columnar=True
+    )
+    assert isinstance(history, FederatedHistory)
+    assert results == [1, 2, 3]
+    assert len(history) == 2
+    assert list(history.shard_index) == [0, 0, 1]
+    assert history[-1] == FederatedShardResult(1, ("bb",), (2,))
+
+    numeric = FederatedHistory(history, output_typecode="d")
+    numeric.append(FederatedShardResult(7, (), ()))
+    assert memoryview(numeric.outputs).tolist() == [1.0, 3.0, 2.0]
+    assert [r.shard_index for r in numeric] == [0, 1, 7]
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread", "asyncio"])
+def test_checkpoint_resume_evaluates_only_remaining(tmp_path, executor):
+    prompts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff"]
+    calls = []
+
+    def crashing(prompt: str) -> int:
+        if prompt == "eeeee":
+            raise RuntimeError("worker died")
+        calls.append(prompt)
+        return len(prompt)
+
+    with pytest.raises(RuntimeError):
+        run_federated_evaluation(
+            prompts, crashing, shards=2, executor="serial", checkpoint_dir=tmp_path
+        )
+    done = set(calls)
+    calls.clear()
+
+    def evaluate(prompt: str) -> int:
+        calls.append(prompt)
+        return len(prompt)
+
+    results, shard_results = run_federated_evaluation(
+        prompts,
+        evaluate,
+        shards=2,
+        executor=executor,
+        checkpoint_dir=tmp_path,
+        resume=True,
+        return_shard_results=True,
+    )
+    assert results == [1, 2, 3, 4, 5, 6]
+    assert done and not done & set(calls)
+    assert shard_results[0].outputs == (1, 3, 5)
+
+
+def test_resume_truncates_torn_write_and_checks_manifest(tmp_path):
+    prompts = ["a", "bb", "ccc"]
+    run_federated_evaluation(prompts, len, checkpoint_dir=tmp_path)
+    log = tmp_path / "shard-00000.jsonl"
+    log.write_text('[0, 1]\n[1, 2]\n[2, ')
+    calls = []
+    results = run_federated_evaluation(
+        prompts, lambda p: calls.append(p) or len(p), checkpoint_dir=tmp_path, resume=True
+    )
+    assert results == [1, 2, 3] and calls == ["ccc"]
+    assert log.read_text() == "[0, 1]\n[1, 2]\n[2, 3]\n"
+    with pytest.raises(ValueError):
+        run_federated_evaluation(["x"], len, checkpoint_dir=tmp_path, resume=True)
+
+
+def test_cost_partition_balances_shards():
+    prompts = ["x" * 10] + ["y"] * 10
+    _, shard_results = run_federated_evaluation(
+        prompts, len, shards=2, partition="cost", return_shard_results=True
+    )
+    assert [sum(r.outputs) for r in shard_results] == [10, 10]
+    with pytest.raises(ValueError):
+        run_federated_evaluation(prompts, len, cost=len)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process", "asyncio"])
+def test_work_stealing_covers_every_prompt(executor):
+    prompts = [str(i) * (i % 4 + 1) for i in range(23)]
+    results, shard_results = run_federated_evaluation(
+        prompts,
+        len,
+        shards=3,
+        executor=executor,
+        schedule="work_stealing",
+        chunk_size=2,
+        return_shard_results=True,
+    )
+    assert results == [len(p) for p in prompts]
+    assert sorted(p for r in shard_results for p in r.prompts) == sorted(prompts)
+    assert all(r.elapsed >= 0 for r in shard_results)
+
+
+def test_work_stealing_keeps_idle_shards_busy():
+    def evaluate(prompt: str) -> str:
+        time.sleep(0.3 if prompt == "slow" else 0.005)
+        return prompt
+
+    prompts = ["slow"] + ["fast"] * 20
+    _, shard_results = run_federated_evaluation(
+        prompts,
+        evaluate,
+        shards=2,
+        executor="thread",
+        schedule="work_stealing",
+        chunk_size=1,
+        return_shard_results=True,
+    )
+    straggler = next(r for r in shard_results if "slow" in r.prompts)
+    assert len(straggler.prompts) <= 2
+    assert straggler.elapsed >= 0.3
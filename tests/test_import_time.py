@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import teslamind
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = {
+    "teslamind.advanced",
+    "teslamind.federated",
+    "teslamind.refinement",
+    "teslamind.rlhf",
+    "teslamind.safety",
+    "teslamind.catalog",
+    "asyncio",
+    "concurrent.futures",
+    "sqlite3",
+}
+IMPORT_BUDGET_US = int(os.environ.get("TESLAMIND_IMPORT_BUDGET_MS", "100")) * 1000
+
+
+def _importtime(*args: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        cumulative[name] = int(total)
+    return cumulative
+
+
+def test_cli_list_does_not_import_heavy_modules():
+    imported = _importtime("-m", "teslamind.cli", "list")
+    assert not HEAVY_MODULES & set(imported)
+    assert imported["teslamind"] < IMPORT_BUDGET_US
+
+
+def test_public_names_resolve_lazily():
+    assert teslamind.run_federated_evaluation.__module__ == "teslamind.federated"
+    assert "RLHFTrainer" in dir(teslamind)
+    with pytest.raises(AttributeError):
+        teslamind.does_not_exist
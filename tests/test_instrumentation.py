@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from teslamind import filter_clinical_content, run_federated_evaluation
+from teslamind.instrumentation import Aggregator, Instrumentation, set_instrumentation
+from teslamind.refinement import SelfLoopingPromptGenerator
+from teslamind.rlhf import RLHFTrainer
+
+
+@pytest.fixture
+def metrics():
+    aggregator = Aggregator()
+    previous = set_instrumentation(aggregator)
+    yield aggregator
+    set_instrumentation(previous)
+
+
+def _counter(metrics, name):
+    return sum(value for (key, _), value in metrics.counters.items() if key == name)
+
+
+def test_noop_default_records_nothing():
+    instrumentation = Instrumentation()
+    with instrumentation.span("x"):
+        instrumentation.count("y")
+        instrumentation.observe("z", 1.0)
+    assert not instrumentation.enabled
+
+
+def test_pipeline_emits_metrics(metrics):
+    run_federated_evaluation(["a", "b", "c"], str.upper, shards=2, executor="thread")
+    RLHFTrainer(lambda p, f: 1.0, batch_size=2).train(["a", "b", "c"], lambda p: p)
+    SelfLoopingPromptGenerator(max_iters=2).generate("p", lambda p: (p + "!", True))
+    filter_clinical_content("seek medical advice", mask=True)
+
+    shard = metrics.histograms[("federated.shard_seconds", (("executor", "thread"),))]
+    assert shard.count == 2
+    assert _counter(metrics, "federated.prompts") == 3
+    assert _counter(metrics, "rlhf.batches") == 2
+    assert _counter(metrics, "refinement.iterations") == 2
+    assert _counter(metrics, "safety.flagged") == 1
+
+
+def test_exporters(metrics):
+    metrics.count("llm.calls", 2, model="a")
+    metrics.observe("llm.call_seconds", 0.02)
+    data = json.loads(metrics.to_json())
+    assert data["counters"] == [{"name": "llm.calls", "tags": {"model": "a"}, "value": 2}]
+    text = metrics.to_prometheus()
+    assert 'teslamind_llm_calls_total{model="a"} 2' in text
+    assert 'teslamind_llm_call_seconds_bucket{le="0.05"} 1' in text
+    assert "teslamind_llm_call_seconds_count 1" in text
@@ -0,0 +1,45 @@
+import pytest
+
+from teslamind import metrics
+from teslamind.metrics import length_score, score_batch
+
+
+def test_length_score():
+    assert length_score("abc").value == 3
+
+
+@pytest.fixture(params=["array", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(metrics, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(metrics, "np", None)
+    return request.param
+
+
+def _is_column(column, backend):
+    if backend == "numpy":
+        return column.dtype == metrics.np.float64
+    return column.typecode == "d"
+
+
+def test_score_batch_columns(backend):
+    responses = ["Tesla energy energy", "", "A new invention"]
+    columns = score_batch(responses, keywords=["energy", "invention"])
+    assert list(columns) == ["length", "tokens", "diversity", "alignment"]
+    assert all(_is_column(column, backend) for column in columns.values())
+    assert list(columns["length"]) == [19.0, 0.0, 15.0]
+    assert list(columns["tokens"]) == [3.0, 0.0, 3.0]
+    assert list(columns["diversity"]) == pytest.approx([2 / 3, 0.0, 1.0])
+    assert list(columns["alignment"]) == [0.5, 0.0, 0.5]
+
+
+def test_score_batch_empty_input(backend):
+    columns = score_batch([])
+    assert list(columns) == ["length", "tokens", "diversity", "alignment"]
+    assert all(_is_column(column, backend) and len(column) == 0 for column in columns.values())
+
+
+def test_score_batch_rejects_unknown_rubric():
+    with pytest.raises(ValueError):
+        score_batch(["x"], ["clarity"])
@@ -9,3 +9,11 @@ def test_score():
 def test_prompt_meta():
     pm = PromptMeta(title="t", version="1", prompt_path="x")
     assert pm.title == "t"
+
+
+def test_models_are_slotted():
+    s = Score(value=1.0, rubric="clarity")
+    pm = PromptMeta(title="t", version="1", prompt_path="x")
+    assert not hasattr(s, "__dict__") and not hasattr(pm, "__dict__")
+    pm.length_tokens = 3
+    assert pm.length_tokens == 3
@@ -0,0 +1,131 @@
+import gc
+import threading
+import weakref
+
+from teslamind.refinement import RefinementHistory, SelfLoopingPromptGenerator
+
+
+def test_generate_beam_explores_multiple_candidates():
+    def refine(prompt: str):
+        return [(prompt + " a", True), (prompt + " bb", True), (prompt, False)]
+
+    gen = SelfLoopingPromptGenerator(max_iters=3)
+    best, history = gen.generate_beam(
+        "start", refine, lambda p: p.count("b"), beam_width=2, return_history=True
+    )
+    assert isinstance(history, RefinementHistory)
+    assert best == "start bb bb bb"
+    assert history.steps == ["start", "start bb", "start bb bb", "start bb bb bb"]
+    assert history.iterations == 3 and history.stopped_reason == "max_iters"
+    assert len(history.nodes) == 1 + 2 + 4 + 4
+    assert all(history.nodes[n.parent].depth == n.depth - 1 for n in history.nodes[1:])
+
+
+def test_generate_beam_refines_concurrently_and_stops():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def refine(prompt: str):
+        if len(prompt) > 1:
+            barrier.wait()
+            return prompt, False
+        return [(prompt + "x", True), (prompt + "y", True)]
+
+    gen = SelfLoopingPromptGenerator(max_iters=5)
+    best, history = gen.generate_beam("p", refine, len, beam_width=2, return_history=True)
+    assert best in {"px", "py"}
+    assert history.stopped_reason == "no_improvement"
+    assert history.iterations == 2
+
+
+def test_generate_beam_accepts_non_bool_flags():
+    def refine(prompt: str):
+        if len(prompt) < 3:
+            return prompt + "x", 1
+        return [(prompt + "y", 0), (prompt + "z", 0)]
+
+    gen = SelfLoopingPromptGenerator(max_iters=5)
+    best, history = gen.generate_beam("p", refine, len, return_history=True)
+    assert best == "pxx"
+    assert history.stopped_reason == "no_improvement"
+
+
+def test_generate_detects_cycles_and_memoises_calls():
+    calls = []
+
+    def oscillate(prompt: str):
+        calls.append(prompt)
+        return ("B" if prompt == "A" else "A"), True
+
+    gen = SelfLoopingPromptGenerator(max_iters=10, memo_size=16)
+    result, history = gen.generate("A", oscillate, return_history=True)
+    assert history.stopped_reason == "cycle"
+    assert history.steps == ["A", "B", "A"]
+    assert result == "A"
+    gen.generate("B", oscillate)
+    assert calls == ["A", "B"]
+
+
+def test_generate_call_budget():
+    gen = SelfLoopingPromptGenerator(max_iters=10)
+    result, history = gen.generate(
+        "x", lambda p: (p + "x", True), return_history=True, max_calls=3
+    )
+    assert result == "xxxx"
+    assert history.stopped_reason == "budget"
+    assert history.iterations == 3
+
+
+def test_zero_call_budget_and_default_no_memo():
+    calls = []
+
+    def refine(prompt: str):
+        calls.append(prompt)
+        return prompt + "!", True
+
+    gen = SelfLoopingPromptGenerator(max_iters=3)
+    result, history = gen.generate("p", refine, return_history=True, max_calls=0)
+    assert (result, history.stopped_reason, history.iterations) == ("p", "budget", 0)
+    assert calls == []
+    gen.generate("p", refine)
+    gen.generate("p", refine)
+    assert calls == ["p", "p!", "p!!"] * 2
+
+
+def test_memo_does_not_keep_refiner_alive():
+    gen = SelfLoopingPromptGenerator(max_iters=2, memo_size=8)
+    refine = lambda prompt: (prompt + "x", True)  # noqa: E731
+    gen.generate("p", refine)
+    ref = weakref.ref(refine)
+    del refine
+    gc.collect()
+    assert ref() is None
+
+
+def test_memo_works_for_bound_methods():
+    class Refiner:
+        def __init__(self):
+            self.calls = []
+
+        def refine(self, prompt: str):
+            self.calls.append(prompt)
+            return prompt + "x", True
+
+        def shout(self, prompt: str):
+            self.calls.append(prompt.upper())
+            return prompt + "!", True
+
+    gen = SelfLoopingPromptGenerator(max_iters=2, memo_size=8)
+    refiner = Refiner()
+    gen.generate("p", refiner.refine)
+    gen.generate("p", refiner.refine)
+    assert refiner.calls == ["p", "px"]
+    gen.generate("p", refiner.shout)
+    assert refiner.calls == ["p", "px", "P", "P!"]
+    other = Refiner()
+    gen.generate("p", other.refine)
+    assert other.calls == ["p", "px"]
+
+    ref = weakref.ref(refiner)
+    del refiner
+    gc.collect()
+    assert ref() is None
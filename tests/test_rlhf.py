@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+
+from teslamind.rlhf import (
+    JSONLSink,
+    RLHFHistory,
+    RLHFResult,
+    RLHFTrainer,
+    RewardStats,
+    batched,
+)
+
+
+def _reward(prompt: str, feedback: str) -> float:
+    return float(len(feedback))
+
+
+def _feedback(prompt: str) -> str:
+    return prompt * 2
+
+
+def test_batched_callables_match_serial_path():
+    prompts = [f"p{i}" * (i % 3) for i in range(10)]
+    calls = []
+
+    @batched
+    def feedback_batch(chunk):
+        calls.append(len(chunk))
+        return [_feedback(p) for p in chunk]
+
+    @batched
+    def reward_batch(chunk, feedback):
+        return [_reward(p, f) for p, f in zip(chunk, feedback)]
+
+    serial = RLHFTrainer(_reward, threshold=3).train(prompts, _feedback, return_history=True)
+    batched_run = RLHFTrainer(reward_batch, threshold=3, batch_size=4).train(
+        prompts, feedback_batch, return_history=True
+    )
+    assert batched_run == serial
+    assert calls == [4, 4, 2]
+
+
+def test_concurrent_feedback_preserves_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def slow_feedback(prompt: str) -> str:
+        barrier.wait()
+        return prompt.upper()
+
+    trainer = RLHFTrainer(lambda p, f: 1.0, max_workers=3)
+    kept, history = trainer.train(["a", "b", "c"], slow_feedback, return_history=True)
+    assert kept == ["a", "b", "c"]
+    assert [r.feedback for r in history] == ["A", "B", "C"]
+
+
+def test_batched_length_mismatch_rejected():
+    trainer = RLHFTrainer(_reward, batch_size=2)
+    with pytest.raises(ValueError):
+        trainer.train(["a", "b"], batched(lambda chunk: ["only one"]))
+
+
+def test_iter_train_streams_with_sink_and_stats(tmp_path):
+    def endless():
+        n = 0
+        while True:
+            yield "keep" if n % 2 == 0 else "drop"
+            n += 1
+
+    trainer = RLHFTrainer(lambda p, f: 1.0 if f == "keep" else 0.0, threshold=0.5)
+    stats = RewardStats()
+    path = tmp_path / "history.jsonl"
+    with JSONLSink(path) as sink:
+        stream = trainer.iter_train(endless(), lambda p: p, kept_only=True, sink=sink, stats=stats)
+        first = [next(stream) for _ in range(3)]
+    assert [r.prompt for r in first] == ["keep"] * 3
+    assert stats.count == 5 and stats.passed == 3
+    assert stats.mean == pytest.approx(0.6)
+    assert stats.pass_rate == pytest.approx(0.6)
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[1]) == {"prompt": "drop", "feedback": "drop", "reward": 0.0}
+
+
+def test_columnar_history_and_slotted_records():
+    trainer = RLHFTrainer(_reward, threshold=3)
+    kept, history = trainer.train(["a", "bb", "c"], _feedback, return_history=True, columnar=True)
+    assert isinstance(history, RLHFHistory)
+    assert kept == ["bb"]
+    assert list(history) == trainer.train(["a", "bb", "c"], _feedback, return_history=True)[1]
+    assert memoryview(history.rewards).tolist() == [2.0, 4.0, 2.0]
+    assert not hasattr(history[0], "__dict__")
+    with pytest.raises(AttributeError):
+        history[0].reward = 1.0
+
+    sink = RLHFHistory()
+    list(trainer.iter_train(["zz"], _feedback, sink=sink))
+    assert sink[0] == RLHFResult("zz", "zzzz", 4.0)
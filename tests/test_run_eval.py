@@ -0,0 +1,119 @@
+import importlib.util
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+_spec = importlib.util.spec_from_file_location(
+    "run_eval", REPO_ROOT / "evaluation" / "run_eval.py"
+)
+run_eval = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(run_eval)
+
+
+class _Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    """Echoes the prompt text, tracking how many calls overlap."""
+
+    lock = threading.Lock()
+    active = peak = calls = 0
+    fail_on = None
+
+    def __init__(self, *_, **__):
+        pass
+
+    def __call__(self, messages):
+        cls = type(self)
+        text = messages[0].content
+        with cls.lock:
+            cls.calls += 1
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.01)
+            if text == cls.fail_on:
+                raise RuntimeError("model crashed")
+            return _Reply(text)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@pytest.fixture
+def harness(tmp_path, monkeypatch):
+    class LLM(_FakeLLM):
+        pass
+
+    monkeypatch.setattr(run_eval, "ChatOpenAI", LLM)
+    prompts = tmp_path / "prompts"
+    prompts.mkdir()
+    for i in range(20):
+        (prompts / f"p{i:02d}.txt").write_text("x" * (i + 1))
+
+    def run(*args):
+        run_eval.main(
+            [
+                f"--prompts={prompts}",
+                f"--output={tmp_path / 'results.jsonl'}",
+                f"--manifest={tmp_path / 'manifest.sqlite3'}",
+                "--no-cache",
+                *args,
+            ]
+        )
+        return _results(tmp_path / "results.jsonl")
+
+    run.llm = LLM
+    run.prompts = prompts
+    run.manifest = tmp_path / "manifest.sqlite3"
+    return run
+
+
+def _results(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_results_follow_prompt_order_with_bounded_concurrency(harness):
+    results = harness("--concurrency=3")
+    expected = [path.name for path in harness.prompts.glob("*.txt")]
+    assert [row["prompt"] for row in results] == expected
+    assert all(row["score"] == int(row["prompt"][1:3]) + 1 for row in results)
+    assert 1 < harness.llm.peak <= 3
+
+
+def test_crash_keeps_finished_prompts_in_manifest(harness, tmp_path):
+    order = [path.name for path in harness.prompts.glob("*.txt")]
+    harness.llm.fail_on = "x" * (int(order[10][1:3]) + 1)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        harness("--concurrency=2")
+    written = _results(tmp_path / "results.jsonl")
+    assert [row["prompt"] for row in written] == order[:10]
+
+    harness.llm.fail_on = None
+    harness.llm.calls = 0
+    results = harness("--incremental", "--concurrency=2")
+    assert [row["prompt"] for row in results] == order
+    assert harness.llm.calls == 10
+
+
+def test_incremental_reuses_unchanged_prompts_only(harness):
+    harness()
+    assert harness.llm.calls == 20
+
+    harness.llm.calls = 0
+    (harness.prompts / "p03.txt").write_text("edited prompt")
+    results = {row["prompt"]: row["score"] for row in harness("--incremental")}
+    assert harness.llm.calls == 1
+    assert results["p03.txt"] == len("edited prompt")
+    assert results["p04.txt"] == 5
+
+    harness.llm.calls = 0
+    harness.llm.temperature = 0.5
+    harness("--incremental")
+    assert harness.llm.calls == 20
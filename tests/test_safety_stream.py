@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from teslamind.safety import (
+    StreamingSafetyFilter,
+    afilter_clinical_stream,
+    filter_clinical_content,
+    filter_clinical_stream,
+)
+
+
+def test_stream_masks_terms_across_chunk_boundaries():
+    text = "Seek medical advice before any Treatment or diagnosis."
+    chunks = [text[i : i + 3] for i in range(0, len(text), 3)]
+    masked = "".join(filter_clinical_stream(chunks, mask=True))
+    assert masked == filter_clinical_content(text, mask=True)
+
+
+def test_stream_holds_back_only_minimal_tail():
+    stream = StreamingSafetyFilter({"abcd"}, mask=True)
+    assert stream.feed("hello world") == "hello wo"
+    assert stream.feed("ab") == "rl"
+    assert stream.feed("cd!") == "d[REDACTED]"
+    assert stream.flush() == "!"
+
+
+def test_stream_raises_when_not_masking():
+    chunks = iter(["all good so far, ", "then medi", "cal advice"])
+    produced = []
+    with pytest.raises(ValueError, match="medical advice"):
+        for piece in filter_clinical_stream(chunks):
+            produced.append(piece)
+    assert "".join(produced).startswith("all good")
+
+
+def test_async_stream():
+    async def chunks():
+        for piece in ["treat", "ment plan"]:
+            yield piece
+
+    async def collect():
+        return [piece async for piece in afilter_clinical_stream(chunks(), mask=True)]
+
+    assert "".join(asyncio.run(collect())) == "[REDACTED] plan"
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pytest
+
+from teslamind.catalog import PromptCatalog
+from teslamind.search import SearchIndex, tokenize
+
+
+def _catalog(tmp_path: Path) -> PromptCatalog:
+    prompts = tmp_path / "prompts"
+    (prompts / "developer").mkdir(parents=True, exist_ok=True)
+    return PromptCatalog(prompts, None, tmp_path / "catalog.json")
+
+
+def test_tokenize():
+    assert tokenize("Wireless Power, 2024!") == ["wireless", "power", "2024"]
+
+
+def test_bm25_ranking_and_incremental_updates(tmp_path: Path):
+    prompts = tmp_path / "prompts"
+    catalog = _catalog(tmp_path)
+    (prompts / "coil.txt").write_text("Design a tesla coil. The coil must resonate.")
+    (prompts / "grid.txt").write_text("Plan a wireless power grid for a city.")
+    (prompts / "developer" / "audit.txt").write_text("Audit the reward model for coil bias.")
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    assert index.update(catalog) == 3
+
+    hits = index.search("coil")
+    assert [hit.name for hit in hits] == ["coil", "audit"]
+    assert [hit.name for hit in index.search("coil", category="developer")] == ["audit"]
+    assert index.search("nothing matches") == []
+
+    assert index.update(catalog) == 0
+    (prompts / "grid.txt").write_text("Wireless coil charging for every street.")
+    (prompts / "developer" / "audit.txt").unlink()
+    assert index.update(catalog) == 2
+
+    reloaded = SearchIndex(tmp_path / "search.sqlite3")
+    assert len(reloaded) == 2
+    assert {hit.name for hit in reloaded.search("coil")} == {"coil", "grid"}
+
+
+def test_for_catalog_picks_up_in_place_edits(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("TESLAMIND_CACHE_DIR", str(tmp_path / "cache"))
+    prompts = tmp_path / "prompts"
+    catalog = _catalog(tmp_path)
+    coil = prompts / "coil.txt"
+    coil.write_text("Design a tesla coil.")
+    assert [hit.name for hit in SearchIndex.for_catalog(catalog).search("coil")] == ["coil"]
+
+    coil.write_text("Design a dynamo.")  # in place: directory mtime unchanged
+    assert SearchIndex.for_catalog(catalog).search("coil") == []
+    assert [hit.name for hit in SearchIndex.for_catalog(catalog).search("dynamo")] == ["coil"]
+
+
+def test_for_catalog_directory_mode_rescans_only_when_directories_change(
+    tmp_path: Path, monkeypatch
+):
+    monkeypatch.setenv("TESLAMIND_CACHE_DIR", str(tmp_path / "cache"))
+    prompts = tmp_path / "prompts"
+    catalog = _catalog(tmp_path)
+
+    def coil_hits(refresh="directories"):
+        return [hit.name for hit in SearchIndex.for_catalog(catalog, refresh=refresh).search("coil")]
+
+    coil = prompts / "coil.txt"
+    coil.write_text("Design a tesla coil.")
+    assert coil_hits() == ["coil"]
+
+    coil.write_text("Design a dynamo.")  # in place: directory mtime unchanged
+    assert coil_hits() == ["coil"]
+
+    (prompts / "grid.txt").write_text("A coil grid.")
+    assert coil_hits() == ["grid"]
+    (prompts / "grid.txt").unlink()
+    assert coil_hits("never") == ["grid"]
+    with pytest.raises(ValueError):
+        SearchIndex.for_catalog(catalog, refresh="sometimes")
+
+
+def test_corrupt_index_file_is_rebuilt(tmp_path: Path):
+    path = tmp_path / "search.sqlite3"
+    path.write_text("not a database")
+    catalog = _catalog(tmp_path)
+    (tmp_path / "prompts" / "coil.txt").write_text("coil")
+    assert SearchIndex(path).update(catalog) == 1
+    assert len(SearchIndex(path)) == 1
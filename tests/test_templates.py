@@ -0,0 +1,32 @@
+import pytest
+
+from teslamind.modes import energy_prompt
+from teslamind.persona import Persona
+from teslamind.templates import DEFAULT_TEMPLATE, compile_template, compose, render_many
+
+
+def test_compiled_template_is_cached_and_renders():
+    template = compile_template("Plan {task} for {team}. 100% {task}!")
+    assert compile_template("Plan {task} for {team}. 100% {task}!") is template
+    assert template.fields == ("task", "team")
+    assert template.render(task="x", team="y") == "Plan x for y. 100% x!"
+    assert template.render_many(["a", "b"], team="ops") == [
+        "Plan a for ops. 100% a!",
+        "Plan b for ops. 100% b!",
+    ]
+    with pytest.raises(KeyError):
+        template.render(task="x")
+
+
+def test_compose_mode_persona_and_task():
+    persona = Persona(name="Practical Engineer", description="grounded {always}")
+    template = compose("Solve: {task}", mode="energy", persona=persona)
+    assert template.render(task="storage") == (
+        "[Energy Mode] Act as Practical Engineer: grounded {always}. Solve: storage"
+    )
+    assert compose(mode="energy").render(task="go") == energy_prompt(
+        DEFAULT_TEMPLATE.format(task="go")
+    )
+    assert render_many(["a"], "{task}", mode="patent") == ["[Patent Mode] a"]
+    with pytest.raises(ValueError):
+        compose(mode="unknown")
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import pytest
+
+from teslamind.tokenizer import PRETOKENIZE, BPETokenizer, count_tokens, count_tokens_batch
+
+
+def test_trained_merges_shorten_encodings(tmp_path: Path):
+    corpus = ["the tesla coil hums", "the tesla tower", "the coil"] * 5
+    tokenizer = BPETokenizer.train(corpus, 50)
+    assert tokenizer.count("the tesla coil") < len("the tesla coil")
+    path = tmp_path / "merges.txt"
+    tokenizer.save(path)
+    reloaded = BPETokenizer.load(path)
+    assert reloaded.encode("the tesla coil") == tokenizer.encode("the tesla coil")
+    assert BPETokenizer([]).count("abc") == 3
+
+
+def test_default_tokenizer_counts():
+    assert count_tokens("") == 0
+    assert 0 < count_tokens("You are smarter than Nikola Tesla in 2024.") < 20
+    assert count_tokens_batch(["energy", "energy mode"]) == [
+        count_tokens("energy"),
+        count_tokens("energy mode"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["____", "snake_case_name", "it's  a __dunder__ 42!\n\tend ", "naïve café — ok?"],
+)
+def test_pretokenizer_covers_every_character(text):
+    assert "".join(PRETOKENIZE.findall(text)) == text
+    assert count_tokens(text) > 0
+
+
+def test_load_reads_gpt2_merges_format(tmp_path: Path):
+    path = tmp_path / "merges.txt"
+    path.write_text("#version: 0.2\nĠ t\nĠt h\nĠth e\n", encoding="utf-8")
+    tokenizer = BPETokenizer.load(path)
+    assert tokenizer.merges[0] == (b" ", b"t")
+    assert tokenizer.count(" the") == 1
+    assert tokenizer.count("the") == 3
@@ -0,0 +1,22 @@
+import os
+from pathlib import Path
+
+from teslamind.utils import file_digest, file_fingerprint
+
+
+def test_file_fingerprint_fast_path(tmp_path: Path):
+    path = tmp_path / "p.txt"
+    path.write_text("hello")
+    first = file_fingerprint(path)
+    assert first["sha256"] == file_digest(path)
+    assert file_fingerprint(path, {**first, "sha256": "cached"})["sha256"] == "cached"
+
+
+def test_file_fingerprint_rehashes_on_change(tmp_path: Path):
+    path = tmp_path / "p.txt"
+    path.write_text("hello")
+    first = file_fingerprint(path)
+    path.write_text("howdy")
+    os.utime(path, ns=(first["mtime_ns"] + 10**9, first["mtime_ns"] + 10**9))
+    second = file_fingerprint(path, first)
+    assert second["sha256"] != first["sha256"]